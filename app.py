@@ -23,6 +23,12 @@ from src.utils.logger import setup_logging
 # Initialize logging
 setup_logging()
 
+# Sidebar keeps no per-session state, so one instance is shared
+@st.cache_resource
+def _get_sidebar() -> Sidebar:
+    """Shared Sidebar instance"""
+    return Sidebar()
+
 def main():
     """Main application entry point"""
     
@@ -151,7 +157,7 @@ def show_main_app():
     """, unsafe_allow_html=True)
     
     # Initialize sidebar
-    sidebar = Sidebar()
+    sidebar = _get_sidebar()
     selected_page = sidebar.render()
     
     # Initialize dashboard
@@ -11,26 +11,69 @@ import argparse
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from sqlalchemy import text
+
 from src.database.models import (
-    create_tables, drop_tables, db_session,
-    User, EmailTemplate, Contact, ContactList
+    create_tables, drop_tables, db_session, engine,
+    User, EmailTemplate, Contact, ContactList, Campaign
 )
 from src.utils.logger import setup_logging, get_logger
 from src.auth.authentication import Authentication
 
 logger = get_logger(__name__)
 
+# Template search filters with ILIKE '%term%' on name and subject; on Postgres,
+# trigram indexes let those filters use an index scan instead of reading every row
+_TRIGRAM_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_email_templates_name_trgm "
+    "ON email_templates USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_email_templates_subject_trgm "
+    "ON email_templates USING gin (subject gin_trgm_ops)",
+)
+
 def init_database():
     """Initialize database with tables"""
     try:
         logger.info("Creating database tables...")
         create_tables()
         logger.info("Database tables created successfully!")
-        return True
+        return migrate_database()
     except Exception as e:
         logger.error(f"Error creating database tables: {str(e)}")
         return False
 
+def migrate_database():
+    """Add indexes to an existing database; safe to run repeatedly"""
+    try:
+        logger.info("Migrating database indexes...")
+        
+        # create_all only builds indexes for tables it creates
+        for index in Campaign.__table__.indexes:
+            index.create(bind=engine, checkfirst=True)
+        
+        if engine.dialect.name == 'postgresql':
+            _create_trigram_indexes()
+        
+        logger.info("Database indexes are up to date!")
+        return True
+    except Exception as e:
+        logger.error(f"Error migrating database: {str(e)}")
+        return False
+
+def _create_trigram_indexes():
+    """Create the pg_trgm template search indexes, skipping them if the extension is unavailable"""
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except Exception as e:
+        # Needs CREATE privilege on the database; search still works without the indexes
+        logger.error(f"Could not enable pg_trgm, skipping trigram indexes: {str(e)}")
+        return
+    
+    with engine.begin() as conn:
+        for statement in _TRIGRAM_INDEXES:
+            conn.execute(text(statement))
+
 def create_sample_data():
     """Create sample data for testing"""
     try:
@@ -250,8 +293,9 @@ def main():
     parser = argparse.ArgumentParser(description="Database initialization script")
     parser.add_argument(
         'action',
-        choices=['init', 'reset', 'sample'],
-        help='Action to perform: init (create tables), reset (drop and recreate), sample (add sample data)'
+        choices=['init', 'migrate', 'reset', 'sample'],
+        help='Action to perform: init (create tables), migrate (add indexes to an existing database), '
+             'reset (drop and recreate), sample (add sample data)'
     )
     
     args = parser.parse_args()
@@ -264,6 +308,8 @@ def main():
     
     if args.action == 'init':
         success = init_database()
+    elif args.action == 'migrate':
+        success = migrate_database()
     elif args.action == 'reset':
         success = reset_database()
     elif args.action == 'sample':
@@ -11,7 +11,7 @@ try:
 except ImportError:
     GOOGLE_OAUTH_AVAILABLE = False
     GoogleOAuth = None
-from src.utils.security import SecurityManager
+from src.utils.security import get_security_manager
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +19,7 @@ class Authentication:
     """Handles user authentication and session management"""
     
     def __init__(self):
-        self.security_manager = SecurityManager()
+        self.security_manager = get_security_manager()
         if GOOGLE_OAUTH_AVAILABLE and GoogleOAuth:
             self.google_oauth = GoogleOAuth()
         else:
@@ -7,7 +7,7 @@ import re
 from typing import Optional, Dict, Any
 from src.database.models import User, db_session
 from src.utils.google_oauth import GoogleOAuth
-from src.utils.security import SecurityManager
+from src.utils.security import get_security_manager
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +15,7 @@ class Authentication:
     """Handles user authentication and session management"""
     
     def __init__(self):
-        self.security_manager = SecurityManager()
+        self.security_manager = get_security_manager()
         self.google_oauth = GoogleOAuth()
         
     def show_login_page(self):
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Text, Float, ForeignKey, JSON
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Text, Float, ForeignKey, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship, Session
 from sqlalchemy.dialects.postgresql import UUID
@@ -180,6 +180,11 @@ class Campaign(Base):
     user = relationship("User", back_populates="campaigns")
     template = relationship("EmailTemplate", back_populates="campaigns")
     email_logs = relationship("EmailLog", back_populates="campaign")
+    
+    # Campaign list queries filter by user, status and creation date
+    __table_args__ = (
+        Index('ix_campaigns_user_status_created', 'user_id', 'status', 'created_at'),
+    )
 
 class EmailLog(Base):
     """Email sending log model"""
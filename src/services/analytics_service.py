@@ -2,7 +2,7 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import pandas as pd
 import json
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, case
 import json
 
 from src.database.models import Campaign, Contact, EmailLog, User, db_session
@@ -120,30 +120,39 @@ class AnalyticsService:
         """Get campaign performance data."""
         try:
             with db_session() as session:
-                campaigns = session.query(Campaign).filter(
+                # Aggregate log stats per campaign in one grouped query
+                rows = session.query(
+                    Campaign.id,
+                    Campaign.name,
+                    Campaign.campaign_type,
+                    Campaign.created_at,
+                    func.count(EmailLog.id).label('sent_count'),
+                    func.count(EmailLog.opened_at).label('opened'),
+                    func.count(EmailLog.clicked_at).label('clicked'),
+                    func.sum(case((EmailLog.status == 'bounced', 1), else_=0)).label('bounced')
+                ).outerjoin(
+                    EmailLog, EmailLog.campaign_id == Campaign.id
+                ).filter(
                     Campaign.user_id == user_id,
                     Campaign.created_at.between(start_date, end_date)
+                ).group_by(
+                    Campaign.id, Campaign.name, Campaign.campaign_type, Campaign.created_at
                 ).all()
                 
                 campaign_data = []
-                for campaign in campaigns:
-                    # Get campaign stats
-                    logs = session.query(EmailLog).filter(EmailLog.campaign_id == str(campaign.id)).all()
-                    
-                    sent_count = len(logs)
-                    opened = len([log for log in logs if log.opened_at])
-                    clicked = len([log for log in logs if log.clicked_at])
-                    bounced = len([log for log in logs if log.status == 'bounced'])
+                for row in rows:
+                    sent_count = row.sent_count
+                    bounced = row.bounced or 0
                     
                     campaign_data.append({
-                        'campaign_id': str(campaign.id),
-                        'campaign_name': campaign.name,
-                        'campaign_type': campaign.campaign_type,
+                        'campaign_id': str(row.id),
+                        'campaign_name': row.name,
+                        'campaign_type': row.campaign_type,
                         'sent_count': sent_count,
-                        'open_rate': (opened / sent_count * 100) if sent_count > 0 else 0,
-                        'click_rate': (clicked / sent_count * 100) if sent_count > 0 else 0,
+                        'open_rate': (row.opened / sent_count * 100) if sent_count > 0 else 0,
+                        'click_rate': (row.clicked / sent_count * 100) if sent_count > 0 else 0,
                         'bounce_rate': (bounced / sent_count * 100) if sent_count > 0 else 0,
-                        'created_at': campaign.created_at.isoformat() if campaign.created_at else None
+                        'created_at': row.created_at.isoformat() if row.created_at else None
                     })
                 
                 return campaign_data
@@ -392,35 +401,79 @@ class AnalyticsService:
             logger.error(f"Failed to get live campaign status: {str(e)}")
             return []
 
+    def get_campaigns_list(self, user_id: str, status_filter: str = None, search_term: str = None,
+                           created_after: datetime = None) -> List[Dict[str, Any]]:
+        """Get campaigns list with filtering applied in the database query."""
+        try:
+            with db_session() as session:
+                query = session.query(Campaign).filter(Campaign.user_id == user_id)
+                
+                # Apply filters
+                if status_filter:
+                    query = query.filter(Campaign.status == status_filter)
+                
+                if created_after:
+                    query = query.filter(Campaign.created_at >= created_after)
+                
+                if search_term:
+                    query = query.filter(Campaign.name.icontains(search_term, autoescape=True))
+                
+                campaigns = query.order_by(Campaign.created_at.desc()).all()
+                
+                return [
+                    {
+                        'id': str(campaign.id),
+                        'name': campaign.name,
+                        'subject': campaign.subject,
+                        'status': campaign.status,
+                        'sent_count': campaign.recipient_count or 0,
+                        'delivered_count': campaign.delivered_count or 0,
+                        'opened_count': campaign.opened_count or 0,
+                        'clicked_count': campaign.clicked_count or 0,
+                        'created_at': campaign.created_at.strftime('%Y-%m-%d %H:%M') if campaign.created_at else 'N/A'
+                    }
+                    for campaign in campaigns
+                ]
+                
+        except Exception as e:
+            logger.error(f"Failed to get campaigns list: {str(e)}")
+            return []
+    
     def get_recent_campaigns(self, user_id: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Get recent campaigns with their performance metrics."""
         try:
             with db_session() as session:
-                recent_campaigns = session.query(Campaign).filter(
+                # Aggregate log stats per campaign in one grouped query
+                rows = session.query(
+                    Campaign.id,
+                    Campaign.name,
+                    Campaign.status,
+                    Campaign.created_at,
+                    func.count(EmailLog.id).label('sent_count'),
+                    func.count(EmailLog.opened_at).label('open_count'),
+                    func.count(EmailLog.clicked_at).label('click_count')
+                ).outerjoin(
+                    EmailLog, EmailLog.campaign_id == Campaign.id
+                ).filter(
                     Campaign.user_id == user_id
+                ).group_by(
+                    Campaign.id, Campaign.name, Campaign.status, Campaign.created_at
                 ).order_by(Campaign.created_at.desc()).limit(limit).all()
                 
                 campaigns_data = []
-                for campaign in recent_campaigns:
-                    # Get campaign logs
-                    logs = session.query(EmailLog).filter(
-                        EmailLog.campaign_id == str(campaign.id)
-                    ).all()
-                    
-                    sent_count = len(logs)
-                    opened_count = len([log for log in logs if log.opened_at])
-                    clicked_count = len([log for log in logs if log.clicked_at])
+                for row in rows:
+                    sent_count = row.sent_count
                     
                     campaigns_data.append({
-                        'id': str(campaign.id),
-                        'name': campaign.name,
-                        'status': campaign.status,
+                        'id': str(row.id),
+                        'name': row.name,
+                        'status': row.status,
                         'sent_count': sent_count,
-                        'open_count': opened_count,
-                        'click_count': clicked_count,
-                        'open_rate': round((opened_count / sent_count * 100) if sent_count > 0 else 0, 2),
-                        'click_rate': round((clicked_count / sent_count * 100) if sent_count > 0 else 0, 2),
-                        'created_at': campaign.created_at.strftime('%Y-%m-%d %H:%M') if campaign.created_at else 'N/A'
+                        'open_count': row.open_count,
+                        'click_count': row.click_count,
+                        'open_rate': round((row.open_count / sent_count * 100) if sent_count > 0 else 0, 2),
+                        'click_rate': round((row.click_count / sent_count * 100) if sent_count > 0 else 0, 2),
+                        'created_at': row.created_at.strftime('%Y-%m-%d %H:%M') if row.created_at else 'N/A'
                     })
                 
                 return campaigns_data
@@ -5,7 +5,7 @@ from datetime import datetime
 
 from src.database.models import Contact, ContactList, ContactListMember, User, db_session
 from src.utils.logger import EmailSenderLogger
-from src.utils.security import SecurityManager
+from src.utils.security import get_security_manager
 
 logger = EmailSenderLogger('contact_service')
 
@@ -13,7 +13,7 @@ class ContactService:
     """Handles contact management operations"""
     
     def __init__(self):
-        self.security_manager = SecurityManager()
+        self.security_manager = get_security_manager()
     
     def import_contacts_from_csv(self, user_id: int, csv_content: str, 
                                 source: str = 'csv_import') -> Dict[str, Any]:
@@ -27,7 +27,8 @@ from datetime import datetime
 
 from src.database.models import Campaign, Contact, EmailLog, User, db_session
 from src.utils.logger import EmailSenderLogger
-from src.utils.security import SecurityManager
+from src.utils.security import get_security_manager
+from src.services.template_service import render_placeholders
 
 logger = EmailSenderLogger('email_service')
 
@@ -35,7 +36,7 @@ class EmailService:
     """Handles email sending operations"""
     
     def __init__(self):
-        self.security_manager = SecurityManager()
+        self.security_manager = get_security_manager()
         self.sendgrid_api_key = os.getenv('SENDGRID_API_KEY')
         self.aws_access_key = os.getenv('AWS_ACCESS_KEY_ID')
         self.aws_secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
@@ -846,28 +847,22 @@ class EmailService:
         if not content:
             return content
         
-        # Basic personalization
-        personalized = content
-        
         # Replace common variables
         replacements = {
-            '{{first_name}}': recipient.get('first_name', ''),
-            '{{last_name}}': recipient.get('last_name', ''),
-            '{{full_name}}': f"{recipient.get('first_name', '')} {recipient.get('last_name', '')}".strip(),
-            '{{email}}': recipient.get('email', ''),
-            '{{company}}': recipient.get('company', ''),
+            'first_name': recipient.get('first_name', ''),
+            'last_name': recipient.get('last_name', ''),
+            'full_name': f"{recipient.get('first_name', '')} {recipient.get('last_name', '')}".strip(),
+            'email': recipient.get('email', ''),
+            'company': recipient.get('company', ''),
         }
         
         # Add custom fields
         custom_fields = recipient.get('custom_fields', {})
         for field_name, field_value in custom_fields.items():
-            replacements[f'{{{{custom.{field_name}}}}}'] = str(field_value)
-        
-        # Apply replacements
-        for placeholder, value in replacements.items():
-            personalized = personalized.replace(placeholder, value)
+            replacements[f'custom.{field_name}'] = field_value
         
-        return personalized
+        # Same substitution the template editor uses for previews
+        return render_placeholders(content, replacements)
     
     def _log_email(self, user_id: int, to_email: str, subject: str,
                    html_content: str = None, text_content: str = None,
@@ -5,15 +5,28 @@ import re
 
 from src.database.models import EmailTemplate, User, db_session
 from src.utils.logger import EmailSenderLogger
-from src.utils.security import SecurityManager
+from src.utils.security import get_security_manager
 
 logger = EmailSenderLogger('template_service')
 
+# {{name}} or {{custom.field}} placeholders, as written in templates and subjects
+_PLACEHOLDER_RE = re.compile(r'\{\{([\w.]+)\}\}')
+
+def render_placeholders(content: str, data: Dict[str, Any]) -> str:
+    """Replace {{name}} placeholders with values from data in one pass; unknown placeholders are left as-is"""
+    if not content:
+        return content
+    
+    return _PLACEHOLDER_RE.sub(
+        lambda match: str(data[match.group(1)]) if match.group(1) in data else match.group(0),
+        content
+    )
+
 class TemplateService:
     """Handles email template operations"""
     
     def __init__(self):
-        self.security_manager = SecurityManager()
+        self.security_manager = get_security_manager()
     
     def create_template(self, user_id: int, template_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new email template"""
@@ -525,17 +538,7 @@ class TemplateService:
     def _render_template(self, content: str, data: Dict[str, Any]) -> str:
         """Render template with data"""
         
-        if not content:
-            return content
-        
-        rendered = content
-        
-        # Replace variables
-        for key, value in data.items():
-            placeholder = f'{{{{{key}}}}}'
-            rendered = rendered.replace(placeholder, str(value))
-        
-        return rendered
+        return render_placeholders(content, data)
     
     def _get_welcome_simple_template(self) -> str:
         """Get simple welcome template HTML"""
@@ -332,6 +332,9 @@ class CampaignBuilder:
                 else:
                     st.error(f"Campaign failed: {result['error']}")
             
+            # Cached dashboard queries don't know about the new campaign yet
+            st.cache_data.clear()
+            
             logger.info(f"One-time campaign created: {name}")
             
         except Exception as e:
@@ -358,6 +361,9 @@ class CampaignBuilder:
             campaign_id = self.email_service.create_drip_campaign(campaign_data)
             st.success(f"Drip campaign '{name}' created successfully with {len(email_sequence)} emails!")
             
+            # Cached dashboard queries don't know about the new campaign yet
+            st.cache_data.clear()
+            
             logger.info(f"Drip campaign created: {name}")
             
         except Exception as e:
@@ -386,6 +392,9 @@ class CampaignBuilder:
             campaign_id = self.email_service.create_ab_test_campaign(campaign_data)
             st.success(f"A/B test campaign '{name}' created successfully!")
             
+            # Cached dashboard queries don't know about the new campaign yet
+            st.cache_data.clear()
+            
             logger.info(f"A/B test campaign created: {name}")
             
         except Exception as e:
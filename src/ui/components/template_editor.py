@@ -1,17 +1,106 @@
+import io
+import re
+import jinja2
+from markupsafe import Markup, escape
 import streamlit as st
+import pandas as pd
 from datetime import datetime
-from typing import Dict, List, Any
+from pathlib import Path
+from typing import Dict, List, Any, Optional
 
-from src.services.template_service import TemplateService
-from src.ui.components.ai_helper import AIHelper
+from src.services.template_service import TemplateService, render_placeholders
 from src.utils.session_state import save_form_data, get_form_data
 
+# Default HTML shown in the editor for new templates
+_DEFAULT_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>{{subject}}</title>
+</head>
+<body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
+    <div style="text-align: center; margin-bottom: 30px;">
+        <h1 style="color: #667eea;">Hello, {{first_name}}!</h1>
+    </div>
+    
+    <div style="margin: 20px 0;">
+        <p>Welcome to our email! This is a sample template that you can customize.</p>
+        <p>You can use variables like {{first_name}}, {{last_name}}, {{company}}, and {{email}} to personalize your emails.</p>
+    </div>
+    
+    <div style="background: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0;">
+        <h3 style="margin-top: 0; color: #667eea;">What's Next?</h3>
+        <ul>
+            <li>Customize this template to match your brand</li>
+            <li>Add your own content and styling</li>
+            <li>Test with different variables</li>
+        </ul>
+    </div>
+    
+    <div style="text-align: center; margin: 30px 0;">
+        <a href="#" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 12px 30px; text-decoration: none; border-radius: 25px; font-weight: bold;">
+            Call to Action
+        </a>
+    </div>
+    
+    <div style="border-top: 1px solid #e9ecef; padding-top: 20px; margin-top: 30px; text-align: center; color: #666; font-size: 14px;">
+        <p>© 2025 {{company}}. All rights reserved.</p>
+        <p><a href="{{unsubscribe_url}}" style="color: #667eea;">Unsubscribe</a></p>
+    </div>
+</body>
+</html>"""
+
+# Largest HTML file accepted by the import uploader
+_MAX_HTML_UPLOAD_BYTES = 5 * 1024 * 1024
+
+# Template categories offered in the editor forms
+_CATEGORY_CHOICES = ("General", "Welcome", "Newsletter", "Promotional", "Transactional", "Other")
+_CATEGORY_INDEX = {c.lower(): i for i, c in enumerate(_CATEGORY_CHOICES)}
+
+# Any line-ending convention, so pasted Windows footers convert cleanly
+_NEWLINE_RE = re.compile(r'\r\n|\r|\n')
+
+def _form_data_cached() -> Dict:
+    """Saved template form data, read once and kept in session state until the next save"""
+    if '_tpl_form_cache' not in st.session_state:
+        st.session_state['_tpl_form_cache'] = get_form_data('template_editor') or {}
+    return st.session_state['_tpl_form_cache']
+
+def _first_missing(*fields) -> Optional[str]:
+    """Label of the first empty (value, label) pair, or None when all are filled"""
+    return next((label for value, label in fields if not value), None)
+
+def _nl2br(value: str) -> Markup:
+    """Escape text and convert its line breaks to <br> tags"""
+    return Markup(_NEWLINE_RE.sub('<br>', str(escape(value))))
+
+# Trusted Jinja environment for the visual editor scaffold shipped with the app
+_jinja_env = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(Path(__file__).resolve().parent.parent / 'templates'),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=256,
+    undefined=jinja2.DebugUndefined
+)
+_jinja_env.filters['nl2br'] = _nl2br
+
+def _get_ai_helper():
+    """Create the AI helper, importing its dependencies on first use"""
+    from src.ui.components.ai_helper import AIHelper
+    return AIHelper()
+
 class TemplateEditor:
     """Template editor component"""
     
     def __init__(self):
         self.template_service = TemplateService()
-        self.ai_helper = AIHelper()
+    
+    @property
+    def ai_helper(self):
+        """AI helper, created lazily so pages without AI tools skip its imports"""
+        if not hasattr(self, '_ai_helper'):
+            self._ai_helper = _get_ai_helper()
+        return self._ai_helper
     
     def render(self):
         """Render the template editor interface"""
@@ -47,7 +136,15 @@ class TemplateEditor:
         """Render template creation/edit form"""
         
         # Get saved form data
-        form_data = get_form_data('template_editor') if not template_data else template_data
+        form_data = _form_data_cached() if not template_data else template_data
+        
+        # Unpack widget defaults once
+        name_default = form_data.get('name', '')
+        subject_default = form_data.get('subject', '')
+        category_default = form_data.get('category', 'general')
+        is_public_default = form_data.get('is_public', False)
+        html_default = form_data.get('html_content') or _DEFAULT_HTML_TEMPLATE
+        text_default = form_data.get('text_content', '')
         
         with st.form("template_form"):
             # Basic information
@@ -58,40 +155,40 @@ class TemplateEditor:
             with col1:
                 name = st.text_input(
                     "Template Name *",
-                    value=form_data.get('name', ''),
+                    value=name_default,
                     placeholder="e.g., Welcome Email"
                 )
                 
                 category = st.selectbox(
                     "Category",
-                    ["General", "Welcome", "Newsletter", "Promotional", "Transactional", "Other"],
-                    index=0 if not form_data.get('category') else 
-                          ["general", "welcome", "newsletter", "promotional", "transactional", "other"].index(form_data.get('category', 'general'))
+                    _CATEGORY_CHOICES,
+                    index=_CATEGORY_INDEX.get(category_default, 0)
                 )
             
             with col2:
                 subject = st.text_input(
                     "Email Subject *",
-                    value=form_data.get('subject', ''),
+                    value=subject_default,
                     placeholder="e.g., Welcome to {{company}}!"
                 )
                 
                 is_public = st.checkbox(
                     "Make template public",
-                    value=form_data.get('is_public', False),
+                    value=is_public_default,
                     help="Public templates can be used by other users"
                 )
               # Content creation
             st.markdown("### 🎨 Email Content")
             
             # Content editor tabs
-            content_tab1, content_tab2, content_tab3, content_tab4 = st.tabs(["📝 Visual Editor", "💻 HTML Editor", "📋 Text Version", "🤖 AI Assistant"])
+            content_tab1, content_tab2, content_tab3 = st.tabs(["📝 Visual Editor", "💻 HTML Editor", "📋 Text Version"])
             
             with content_tab1:
                 # Visual editor (simplified)
                 st.markdown("**Visual Email Builder**")
                 
                 # Header section
+                header_text, header_image = '', ''
                 with st.expander("📍 Header Section"):
                     header_type = st.selectbox("Header Type", ["None", "Text Only", "Logo + Text", "Image Banner"])
                     
@@ -104,15 +201,22 @@ class TemplateEditor:
                 with st.expander("📄 Body Content"):
                     body_sections = st.number_input("Number of sections", min_value=1, max_value=5, value=2)
                     
-                    sections_content = []
-                    for i in range(int(body_sections)):
-                        st.markdown(f"**Section {i+1}**")
-                        section_title = st.text_input(f"Section {i+1} Title", key=f"section_title_{i}")
-                        section_content = st.text_area(f"Section {i+1} Content", key=f"section_content_{i}")
-                        sections_content.append({
-                            'title': section_title,
-                            'content': section_content
-                        })
+                    # One editor for all sections instead of two widgets per section
+                    default_sections = pd.DataFrame({
+                        'title': [''] * int(body_sections),
+                        'content': [''] * int(body_sections)
+                    })
+                    edited_sections = st.data_editor(
+                        default_sections,
+                        num_rows="dynamic",
+                        use_container_width=True,
+                        column_config={
+                            'title': st.column_config.TextColumn("Section Title"),
+                            'content': st.column_config.TextColumn("Section Content")
+                        },
+                        key="sections_editor"
+                    )
+                    sections_content = edited_sections.fillna('').to_dict(orient='records')
                   # Footer section
                 with st.expander("📍 Footer Section"):
                     footer_text = st.text_area(
@@ -120,13 +224,17 @@ class TemplateEditor:
                         value="© 2025 {{company}}. All rights reserved.\n\n[Unsubscribe]({{unsubscribe_url}})"
                     )
                 
-                # Note about HTML generation
-                st.info("� Use the 'Generate HTML' button below the form to create HTML from this visual editor.")
+                # Replace the HTML editor content with the visual editor output
+                if st.form_submit_button("🛠️ Generate HTML"):
+                    st.session_state['generated_html'] = self._generate_html_from_visual_editor(
+                        header_type, header_text, header_image, sections_content, footer_text
+                    )
+                    st.rerun()
             with content_tab2:
                 # HTML editor
                 html_content = st.text_area(
                     "HTML Content",
-                    value=st.session_state.get('generated_html', form_data.get('html_content', self._get_default_html_template())),
+                    value=st.session_state.get('generated_html', html_default),
                     height=400,
                     help="Use {{variable}} for personalization (e.g., {{first_name}}, {{company}})"
                 )
@@ -138,15 +246,11 @@ class TemplateEditor:
                     # Text version
                     text_content = st.text_area(
                         "Plain Text Version",
-                        value=form_data.get('text_content', ''),
+                        value=text_default,
                         height=200,
                         help="Plain text version for email clients that don't support HTML"
                     )
             
-            with content_tab4:
-                # AI Assistant tab
-                self._render_ai_assistant_tab(subject, html_content)
-            
             # Preview section
             st.markdown("### 👁️ Preview")
             
@@ -162,13 +266,11 @@ class TemplateEditor:
                         'company': 'Example Corp'
                     }
                     
-                    # Show preview in an expander
-                    with st.expander("📧 Email Preview", expanded=True):
-                        # Render preview
-                        preview_html = self._render_template_preview(html_content, sample_data)
-                        st.markdown(f"**Subject:** {self._render_template_preview(subject, sample_data)}")
-                        st.markdown("**HTML Content:**")
-                        st.components.v1.html(preview_html, height=400, scrolling=True)
+                    # Keep the rendered preview; the iframe is shown below the form on demand
+                    st.session_state['_last_preview'] = {
+                        'subject': self._render_template_preview(subject, sample_data),
+                        'html': self._render_template_preview(html_content, sample_data)
+                    }
             
             with col2:
                 # AI generation button
@@ -199,34 +301,41 @@ class TemplateEditor:
                 
                 if submitted:
                     # Validate required fields
-                    if not name:
-                        st.error("Template name is required")
-                    elif not subject:
-                        st.error("Email subject is required")
-                    elif not html_content:
-                        st.error("HTML content is required")
+                    missing = _first_missing(
+                        (name, "Template name"), (subject, "Email subject"), (html_content, "HTML content")
+                    )
+                    if missing:
+                        st.error(f"{missing} is required")
                     else:
                         # Save template
-                        template_data = {
-                            'name': name,
-                            'subject': subject,
-                            'html_content': html_content,
-                            'text_content': text_content,
-                            'category': category.lower(),
-                            'is_public': is_public
-                        }
-                        
-                        result = self.template_service.create_template(
-                            st.session_state.user_id, template_data
+                        saved = self._save_template(
+                            name=name,
+                            subject=subject,
+                            html_content=html_content,
+                            text_content=text_content,
+                            category=category.lower(),
+                            is_public=is_public
                         )
                         
-                        if result['success']:
-                            st.success("Template saved successfully!")
+                        if saved:
                             # Clear form data
                             save_form_data('template_editor', {})
+                            st.session_state.pop('_tpl_form_cache', None)
+                            st.session_state.pop('_last_preview', None)
+                            st.session_state.pop('generated_html', None)
                             st.rerun()
-                        else:
-                            st.error(f"Error: {result['error']}")
+        
+        # AI tools have their own buttons, so they sit outside the form where the fragment can rerun alone
+        with st.expander("🤖 AI Assistant"):
+            self._render_ai_assistant_tab(subject, html_content)
+        
+        # Preview iframe is only rendered when requested
+        last_preview = st.session_state.get('_last_preview')
+        if last_preview and st.toggle("Show preview", value=False, key="show_template_preview"):
+            with st.expander("📧 Email Preview", expanded=True):
+                st.markdown(f"**Subject:** {last_preview['subject']}")
+                st.markdown("**HTML Content:**")
+                st.components.v1.html(last_preview['html'], height=400, scrolling=True)
     
     def _render_predefined_templates(self):
         """Render predefined templates selection"""
@@ -250,41 +359,47 @@ class TemplateEditor:
             
             for idx, template in enumerate(templates):
                 with cols[idx % 3]:
-                    st.markdown(f"""
-                    <div class="template-preview">
-                        <h5>{template['name']}</h5>
-                        <p>{template['description']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        if st.button("👁️ Preview", key=f"preview_predefined_{template['id']}"):
-                            # Show preview
-                            with st.expander(f"Preview: {template['name']}", expanded=True):
-                                st.components.v1.html(template['html_content'], height=300, scrolling=True)
+                    self._render_predefined_card(template)
+    
+    @st.fragment
+    def _render_predefined_card(self, template: Dict):
+        """Render a single predefined template card; reruns are scoped to the card"""
+        
+        st.markdown(f"""
+        <div class="template-preview">
+            <h5>{template['name']}</h5>
+            <p>{template['description']}</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            if st.button("👁️ Preview", key=f"preview_predefined_{template['id']}"):
+                # Show preview
+                with st.expander(f"Preview: {template['name']}", expanded=True):
+                    st.components.v1.html(template['html_content'], height=300, scrolling=True)
+        
+        with col2:
+            if st.button("📝 Use Template", key=f"use_predefined_{template['id']}"):
+                # Create template from predefined
+                template_name = st.text_input(
+                    f"Template Name for {template['name']}",
+                    value=f"My {template['name']}",
+                    key=f"name_for_{template['id']}"
+                )
+                
+                if template_name:
+                    result = self.template_service.create_from_predefined(
+                        st.session_state.user_id,
+                        template['id'],
+                        template_name
+                    )
                     
-                    with col2:
-                        if st.button("📝 Use Template", key=f"use_predefined_{template['id']}"):
-                            # Create template from predefined
-                            template_name = st.text_input(
-                                f"Template Name for {template['name']}",
-                                value=f"My {template['name']}",
-                                key=f"name_for_{template['id']}"
-                            )
-                            
-                            if template_name:
-                                result = self.template_service.create_from_predefined(
-                                    st.session_state.user_id,
-                                    template['id'],
-                                    template_name
-                                )
-                                
-                                if result['success']:
-                                    st.success(f"Template '{template_name}' created successfully!")
-                                else:
-                                    st.error(f"Error: {result['error']}")
+                    if result['success']:
+                        st.success(f"Template '{template_name}' created successfully!")
+                    else:
+                        st.error(f"Error: {result['error']}")
     
     def _render_html_import(self):
         """Render HTML import functionality"""
@@ -304,39 +419,40 @@ class TemplateEditor:
                 help="Upload an HTML file to use as template"
             )
             
-            if uploaded_file is not None:
+            if uploaded_file is not None and uploaded_file.size > _MAX_HTML_UPLOAD_BYTES:
+                st.error(f"HTML file is too large (max {_MAX_HTML_UPLOAD_BYTES // (1024 * 1024)}MB)")
+            
+            elif uploaded_file is not None:
                 try:
-                    html_content = uploaded_file.getvalue().decode('utf-8')
+                    uploaded_file.seek(0)
+                    reader = io.TextIOWrapper(uploaded_file, encoding='utf-8', errors='replace')
+                    html_content = reader.read()
+                    # Detach so the wrapper doesn't close the uploaded file
+                    reader.detach()
                     
-                    # Preview uploaded HTML
-                    with st.expander("📄 Imported HTML Preview"):
-                        st.components.v1.html(html_content, height=300, scrolling=True)
+                    # Preview iframe is only rendered when requested; a collapsed expander still sends it
+                    if st.toggle("Show imported HTML preview", value=False, key="show_imported_html_preview"):
+                        with st.expander("📄 Imported HTML Preview", expanded=True):
+                            st.components.v1.html(html_content, height=300, scrolling=True)
                     
                     # Template details form
                     with st.form("import_html_form"):
                         name = st.text_input("Template Name *", placeholder="e.g., Imported Template")
                         subject = st.text_input("Email Subject *", placeholder="e.g., {{first_name}}, check this out!")
-                        category = st.selectbox("Category", ["General", "Welcome", "Newsletter", "Promotional", "Transactional"])
+                        category = st.selectbox("Category", _CATEGORY_CHOICES)
                         
                         if st.form_submit_button("Import Template"):
-                            if name and subject:
-                                template_data = {
-                                    'name': name,
-                                    'subject': subject,
-                                    'html_content': html_content,
-                                    'category': category.lower()
-                                }
-                                
-                                result = self.template_service.create_template(
-                                    st.session_state.user_id, template_data
+                            missing = _first_missing((name, "Template name"), (subject, "Email subject"))
+                            if not missing:
+                                self._save_template(
+                                    "Template imported successfully!",
+                                    name=name,
+                                    subject=subject,
+                                    html_content=html_content,
+                                    category=category.lower()
                                 )
-                                
-                                if result['success']:
-                                    st.success("Template imported successfully!")
-                                else:
-                                    st.error(f"Error: {result['error']}")
                             else:
-                                st.error("Please fill in template name and subject")
+                                st.error(f"{missing} is required")
                 
                 except Exception as e:
                     st.error(f"Error reading HTML file: {str(e)}")
@@ -349,35 +465,43 @@ class TemplateEditor:
             )
             
             if html_content:
-                # Preview pasted HTML
-                with st.expander("📄 HTML Preview"):
-                    st.components.v1.html(html_content, height=300, scrolling=True)
+                # Preview iframe is only rendered when requested; a collapsed expander still sends it
+                if st.toggle("Show HTML preview", value=False, key="show_pasted_html_preview"):
+                    with st.expander("📄 HTML Preview", expanded=True):
+                        st.components.v1.html(html_content, height=300, scrolling=True)
                 
                 # Template details form
                 with st.form("paste_html_form"):
                     name = st.text_input("Template Name *")
                     subject = st.text_input("Email Subject *")
-                    category = st.selectbox("Category", ["General", "Welcome", "Newsletter", "Promotional", "Transactional"])
+                    category = st.selectbox("Category", _CATEGORY_CHOICES)
                     
                     if st.form_submit_button("Create Template"):
-                        if name and subject:
-                            template_data = {
-                                'name': name,
-                                'subject': subject,
-                                'html_content': html_content,
-                                'category': category.lower()
-                            }
-                            
-                            result = self.template_service.create_template(
-                                st.session_state.user_id, template_data
+                        missing = _first_missing((name, "Template name"), (subject, "Email subject"))
+                        if not missing:
+                            self._save_template(
+                                "Template created successfully!",
+                                name=name,
+                                subject=subject,
+                                html_content=html_content,
+                                category=category.lower()
                             )
-                            
-                            if result['success']:
-                                st.success("Template created successfully!")
-                            else:
-                                st.error(f"Error: {result['error']}")
                         else:
-                            st.error("Please fill in template name and subject")
+                            st.error(f"{missing} is required")
+    
+    def _save_template(self, success_message: str = "Template saved successfully!", **fields) -> bool:
+        """Create a template from form fields and report the outcome"""
+        
+        result = self.template_service.create_template(st.session_state.user_id, fields)
+        
+        if result['success']:
+            # Cached dashboard queries don't know about the new template yet
+            st.cache_data.clear()
+            st.success(success_message)
+            return True
+        
+        st.error(f"Error: {result['error']}")
+        return False
     
     def _render_edit_template(self):
         """Render edit existing template"""
@@ -408,103 +532,24 @@ class TemplateEditor:
     def _generate_html_from_visual_editor(self, header_type, header_text, header_image, sections, footer_text):
         """Generate HTML from visual editor components"""
         
-        html_parts = [
-            '<!DOCTYPE html>',
-            '<html>',
-            '<head>',
-            '<meta charset="utf-8">',
-            '<title>Email Template</title>',
-            '<style>',
-            'body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; }',
-            '.header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; text-align: center; }',
-            '.section { padding: 20px; margin: 20px 0; }',
-            '.footer { background: #f8f9fa; padding: 20px; text-align: center; color: #666; font-size: 14px; }',
-            '</style>',
-            '</head>',
-            '<body>'
-        ]
-        
-        # Header
-        if header_type != "None":
-            html_parts.append('<div class="header">')
-            if header_image:
-                html_parts.append(f'<img src="{header_image}" alt="Logo" style="max-height: 50px; margin-bottom: 10px;">')
-            html_parts.append(f'<h1>{header_text}</h1>')
-            html_parts.append('</div>')
-        
-        # Sections
-        for section in sections:
-            if section['title'] or section['content']:
-                html_parts.append('<div class="section">')
-                if section['title']:
-                    html_parts.append(f'<h2>{section["title"]}</h2>')
-                if section['content']:
-                    html_parts.append(f'<p>{section["content"]}</p>')
-                html_parts.append('</div>')
-        
-        # Footer
-        if footer_text:
-            html_parts.append('<div class="footer">')
-            html_parts.append(footer_text.replace('\n', '<br>'))
-            html_parts.append('</div>')
-        
-        html_parts.extend(['</body>', '</html>'])
-        
-        return '\n'.join(html_parts)
+        return _jinja_env.get_template('visual_email.html.j2').render(
+            header_type=header_type,
+            header_text=header_text,
+            header_image=header_image,
+            sections=sections,
+            footer_text=footer_text
+        )
     
     def _get_default_html_template(self):
         """Get default HTML template"""
-        return """<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>{{subject}}</title>
-</head>
-<body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
-    <div style="text-align: center; margin-bottom: 30px;">
-        <h1 style="color: #667eea;">Hello, {{first_name}}!</h1>
-    </div>
-    
-    <div style="margin: 20px 0;">
-        <p>Welcome to our email! This is a sample template that you can customize.</p>
-        <p>You can use variables like {{first_name}}, {{last_name}}, {{company}}, and {{email}} to personalize your emails.</p>
-    </div>
-    
-    <div style="background: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0;">
-        <h3 style="margin-top: 0; color: #667eea;">What's Next?</h3>
-        <ul>
-            <li>Customize this template to match your brand</li>
-            <li>Add your own content and styling</li>
-            <li>Test with different variables</li>
-        </ul>
-    </div>
-    
-    <div style="text-align: center; margin: 30px 0;">
-        <a href="#" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 12px 30px; text-decoration: none; border-radius: 25px; font-weight: bold;">
-            Call to Action
-        </a>
-    </div>
-    
-    <div style="border-top: 1px solid #e9ecef; padding-top: 20px; margin-top: 30px; text-align: center; color: #666; font-size: 14px;">
-        <p>© 2025 {{company}}. All rights reserved.</p>
-        <p><a href="{{unsubscribe_url}}" style="color: #667eea;">Unsubscribe</a></p>
-    </div>
-</body>
-</html>"""
+        return _DEFAULT_HTML_TEMPLATE
     
     def _render_template_preview(self, content: str, sample_data: Dict) -> str:
         """Render template with sample data"""
-        
-        if not content:
-            return content
-        
-        rendered = content
-        for key, value in sample_data.items():
-            placeholder = f'{{{{{key}}}}}'
-            rendered = rendered.replace(placeholder, str(value))
-        
-        return rendered
+        # Same substitution used when the email is sent, so the preview matches what recipients get
+        return render_placeholders(content, sample_data)
     
+    @st.fragment
     def _render_ai_assistant_tab(self, current_subject: str, current_content: str):
         """Render AI assistant tab with various AI tools."""
         st.markdown("### 🤖 AI-Powered Template Assistant")        # AI tool selection
@@ -1,15 +1,8 @@
 import streamlit as st
-import pandas as pd
-try:
-    import plotly.express as px
-    import plotly.graph_objects as go
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
-    px = None
-    go = None
 from datetime import datetime, timedelta
+from functools import lru_cache, wraps
 import json
+from html import escape
 from typing import Dict, List, Any
 
 from src.database.models import Campaign, Contact, EmailLog, User, db_session
@@ -23,14 +16,287 @@ from src.ui.components.contact_manager import ContactManager
 from src.ui.components.analytics_dashboard import AnalyticsDashboard
 from src.ui.components.automation_builder import AutomationBuilder
 
+# Campaign list date filters, in days; "All Time" has no cutoff
+_DATE_FILTER_DAYS = {"Last 7 days": 7, "Last 30 days": 30, "Last 90 days": 90}
+
+# Campaign list actions and the session key each one sets
+_CAMPAIGN_ACTIONS = {
+    "👁️ View": 'selected_campaign',
+    "✏️ Edit": 'edit_campaign',
+    "📊 Analytics": 'campaign_analytics'
+}
+
+# Columns shown in the campaigns table
+_CAMPAIGN_TABLE_COLUMNS = [
+    'id', 'name', 'subject', 'status', 'sent_count', 'delivered_count',
+    'opened_count', 'clicked_count', 'created_at'
+]
+
+# Chart libraries are imported on first use so pages without charts skip them
+@lru_cache(maxsize=None)
+def _plotly():
+    """Get (plotly.express, plotly.graph_objects), or (None, None) if Plotly is not installed"""
+    try:
+        import plotly.express as px
+        import plotly.graph_objects as go
+        return px, go
+    except ImportError:
+        return None, None
+
+# Predefined template categories shown in the gallery
+_TEMPLATE_GALLERY = (
+    {
+        "name": "Welcome Series",
+        "templates": (
+            {"name": "Simple Welcome", "description": "Clean and simple welcome email"},
+            {"name": "Product Welcome", "description": "Welcome with product highlights"},
+            {"name": "Service Welcome", "description": "Service-focused welcome email"}
+        )
+    },
+    {
+        "name": "Newsletter",
+        "templates": (
+            {"name": "Modern Newsletter", "description": "Contemporary newsletter design"},
+            {"name": "Corporate Newsletter", "description": "Professional corporate style"},
+            {"name": "Creative Newsletter", "description": "Creative and colorful design"}
+        )
+    },
+    {
+        "name": "Promotional",
+        "templates": (
+            {"name": "Sale Announcement", "description": "Eye-catching sale promotion"},
+            {"name": "Product Launch", "description": "New product announcement"},
+            {"name": "Event Invitation", "description": "Professional event invite"}
+        )
+    }
+)
+
+# HTML templates for card grids, filled with str.format_map and rendered as one block
+_GRID_TPL = '<div style="display: flex; flex-wrap: wrap; gap: 1rem;">{cards}</div>'
+_CARD_OPEN = '<div style="flex: 1 1 30%; border: 1px solid #ddd; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;">'
+_TEMPLATE_CARD_TPL = (
+    _CARD_OPEN
+    + '<h5>{name}</h5>'
+    + '<p><strong>Category:</strong> {category}</p>'
+    + '<p><strong>Created:</strong> {created_at}</p>'
+    + '</div>'
+)
+_GALLERY_CARD_TPL = _CARD_OPEN + '<h6>{name}</h6><p>{description}</p></div>'
+_GALLERY_CATEGORY_TPL = '<h3>📁 {name}</h3>' + _GRID_TPL
+
+# Flat list of gallery template names for the picker
+_GALLERY_TEMPLATE_NAMES = tuple(
+    template['name'] for category in _TEMPLATE_GALLERY for template in category['templates']
+)
+
+@st.cache_data
+def _gallery_html() -> str:
+    """Render every gallery category as a single HTML block"""
+    return "".join(
+        _GALLERY_CATEGORY_TPL.format_map({
+            'name': category['name'],
+            'cards': "".join(_GALLERY_CARD_TPL.format_map(template) for template in category['templates'])
+        })
+        for category in _TEMPLATE_GALLERY
+    )
+
+# Sample activity data - replace with real data
+_ACTIVITY_NAMES = ("Campaigns Created", "Emails Sent", "Templates Created", "Contacts Added")
+_ACTIVITY_VALUES = (12, 1250, 8, 340)
+
+# Sample overview report metrics
+_OVERVIEW_METRICS = (
+    ("Total Campaigns", 25),
+    ("Emails Sent", 12500),
+    ("Average Open Rate", "24.5%"),
+    ("Average Click Rate", "3.2%"),
+    ("Total Revenue", "$15,750")
+)
+
+# Services and UI components keep no per-session state, so one instance is shared
+@st.cache_resource
+def _get_email_service() -> EmailService:
+    """Shared EmailService instance"""
+    return EmailService()
+
+@st.cache_resource
+def _get_analytics_service() -> AnalyticsService:
+    """Shared AnalyticsService instance"""
+    return AnalyticsService()
+
+@st.cache_resource
+def _get_template_service() -> TemplateService:
+    """Shared TemplateService instance"""
+    return TemplateService()
+
+@st.cache_resource
+def _get_contact_service() -> ContactService:
+    """Shared ContactService instance"""
+    return ContactService()
+
+@st.cache_resource
+def _get_campaign_builder() -> CampaignBuilder:
+    """Shared CampaignBuilder instance"""
+    return CampaignBuilder()
+
+@st.cache_resource
+def _get_analytics_dashboard() -> AnalyticsDashboard:
+    """Shared AnalyticsDashboard instance"""
+    return AnalyticsDashboard()
+
+@st.cache_resource
+def _get_template_editor() -> TemplateEditor:
+    """Shared TemplateEditor instance"""
+    return TemplateEditor()
+
+@st.cache_resource
+def _get_contact_manager() -> ContactManager:
+    """Shared ContactManager instance"""
+    return ContactManager()
+
+@st.cache_resource
+def _get_automation_builder() -> AutomationBuilder:
+    """Shared AutomationBuilder instance"""
+    return AutomationBuilder()
+
+class _EmptyResult(Exception):
+    """Carries an empty query result out of a cached getter so it is not stored"""
+    
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+
+def _cached_query(func):
+    """Cache an analytics getter briefly, except for empty results, which the services also return on error"""
+    
+    @wraps(func)
+    def nonempty(*args, **kwargs):
+        result = func(*args, **kwargs)
+        if not result:
+            raise _EmptyResult(result)
+        return result
+    
+    cached = st.cache_data(ttl=60, max_entries=128)(nonempty)
+    
+    @wraps(func)
+    def getter(*args, **kwargs):
+        try:
+            return cached(*args, **kwargs)
+        except _EmptyResult as e:
+            return e.value
+    
+    getter.clear = cached.clear
+    return getter
+
+# Analytics queries are cached briefly so widget reruns skip the database
+@_cached_query
+def _cached_dashboard_metrics(user_id, start_date, end_date) -> Dict[str, Any]:
+    """Get dashboard metrics for a date range"""
+    return _get_analytics_service().get_dashboard_metrics(user_id, start_date, end_date)
+
+@_cached_query
+def _cached_recent_campaigns(user_id, limit: int = 5) -> List[Dict[str, Any]]:
+    """Get the most recent campaigns with their metrics"""
+    return _get_analytics_service().get_recent_campaigns(user_id, limit=limit)
+
+@_cached_query
+def _cached_performance_trend(user_id, days: int = 30) -> List[Dict[str, Any]]:
+    """Get daily performance trend data"""
+    return _get_analytics_service().get_performance_trend(user_id, days=days)
+
+@_cached_query
+def _cached_campaigns_list(user_id, status_filter=None, search_term=None, created_after=None) -> List[Dict[str, Any]]:
+    """Get the filtered campaigns list"""
+    return _get_analytics_service().get_campaigns_list(
+        user_id, status_filter=status_filter, search_term=search_term, created_after=created_after
+    )
+
+@_cached_query
+def _cached_campaign_performance(user_id, start_date, end_date):
+    """Get campaign performance data for a date range"""
+    return _get_analytics_service().get_campaign_performance(user_id, start_date, end_date)
+
+@st.cache_data(ttl=60)
+def _build_performance_figure(performance_data: List[Dict[str, Any]]):
+    """Build the performance trend figure, reused while the data is unchanged"""
+    
+    import pandas as pd
+    _, go = _plotly()
+    
+    df = pd.DataFrame(performance_data)
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scattergl(
+        x=df['date'],
+        y=df['sent'],
+        mode='lines+markers',
+        name='Emails Sent',
+        line=dict(color='#667eea')
+    ))
+    
+    fig.add_trace(go.Scattergl(
+        x=df['date'],
+        y=df['opened'],
+        mode='lines+markers',
+        name='Opened',
+        line=dict(color='#28a745')
+    ))
+    
+    fig.add_trace(go.Scattergl(
+        x=df['date'],
+        y=df['clicked'],
+        mode='lines+markers',
+        name='Clicked',
+        line=dict(color='#ffc107')
+    ))
+    
+    fig.update_layout(
+        title="Email Performance (Last 30 Days)",
+        xaxis_title="Date",
+        yaxis_title="Count",
+        height=300,
+        hovermode='x',
+        spikedistance=0
+    )
+    
+    return fig
+
+@st.cache_resource
+def _activity_pie():
+    """Build the activity distribution pie chart once per process"""
+    
+    px, _ = _plotly()
+    fig = px.pie(
+        values=_ACTIVITY_VALUES,
+        names=_ACTIVITY_NAMES,
+        title="Activity Distribution"
+    )
+    
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(height=300)
+    
+    return fig
+
+def _navigate_to(page: str):
+    """Switch the sidebar navigation to another page"""
+    st.session_state.current_page = page
+    st.session_state.navigation_select = page
+
 class Dashboard:
     """Main dashboard controller"""
     
     def __init__(self):
-        self.email_service = EmailService()
-        self.analytics_service = AnalyticsService()
-        self.template_service = TemplateService()
-        self.contact_service = ContactService()
+        self.email_service = _get_email_service()
+        self.analytics_service = _get_analytics_service()
+        self.template_service = _get_template_service()
+        self.contact_service = _get_contact_service()
+        # Read the clock once so every range on the page shares the same dates
+        self._today = datetime.now().date()
+    
+    def _today_range(self, days: int):
+        """Get (start, end) dates covering the last `days` days"""
+        return self._today - timedelta(days=days), self._today
     
     def show_dashboard(self):
         """Show main dashboard"""
@@ -56,20 +322,20 @@ class Dashboard:
         
         st.title("📧 Email Campaigns")
         
-        # Tabs for different campaign views
-        tab1, tab2, tab3 = st.tabs(["📋 All Campaigns", "➕ Create Campaign", "📈 Performance"])
+        # Only the selected view is rendered
+        view = st.radio(
+            "View", ["📋 All Campaigns", "➕ Create Campaign", "📈 Performance"],
+            horizontal=True, label_visibility="collapsed", key="campaigns_tab"
+        )
         
-        with tab1:
-            campaign_builder = CampaignBuilder()
-            campaign_builder.render_campaign_management()
+        if view == "📋 All Campaigns":
+            self._render_campaigns_list()
         
-        with tab2:
-            campaign_builder = CampaignBuilder()
-            campaign_builder.render()
+        elif view == "➕ Create Campaign":
+            _get_campaign_builder().render()
         
-        with tab3:
-            analytics_dashboard = AnalyticsDashboard()
-            analytics_dashboard._render_campaign_analytics({}, datetime.now().date() - timedelta(days=30), datetime.now().date())
+        else:
+            self._render_campaign_performance()
     
     def show_templates(self):
         """Show templates page"""
@@ -81,7 +347,7 @@ class Dashboard:
             self._render_templates_list()
         
         with tab2:
-            template_editor = TemplateEditor()
+            template_editor = _get_template_editor()
             template_editor.render()
         
         with tab3:
@@ -92,7 +358,7 @@ class Dashboard:
         
         st.title("👥 Contact Management")
         
-        contact_manager = ContactManager()
+        contact_manager = _get_contact_manager()
         contact_manager.render()
     
     def show_analytics(self):
@@ -100,7 +366,7 @@ class Dashboard:
         
         st.title("📊 Email Analytics")
         
-        analytics_dashboard = AnalyticsDashboard()
+        analytics_dashboard = _get_analytics_dashboard()
         analytics_dashboard.render()
     
     def show_drip_campaigns(self):
@@ -108,7 +374,7 @@ class Dashboard:
         
         st.title("🔄 Drip Campaigns")
           # Use the campaign builder for drip campaigns
-        campaign_builder = CampaignBuilder()
+        campaign_builder = _get_campaign_builder()
         
         tab1, tab2 = st.tabs(["📋 Active Campaigns", "➕ Create Drip Campaign"])
         
@@ -125,54 +391,63 @@ class Dashboard:
         
         st.title("🧪 A/B Testing")
         
-        tab1, tab2, tab3 = st.tabs(["📊 Test Results", "➕ Create Test", "📈 Insights"])
+        analytics_dashboard = _get_analytics_dashboard()
+        campaign_builder = _get_campaign_builder()
         
-        with tab1:
-            analytics_dashboard = AnalyticsDashboard()
-            analytics_dashboard._render_ab_test_analytics({}, datetime.now().date() - timedelta(days=30), datetime.now().date())
+        view = st.radio(
+            "View", ["📊 Test Results", "➕ Create Test", "📈 Insights"],
+            horizontal=True, label_visibility="collapsed", key="ab_testing_tab"
+        )
         
-        with tab2:
-            campaign_builder = CampaignBuilder()
+        if view == "📊 Test Results":
+            analytics_dashboard._render_ab_test_analytics({}, *self._today_range(30))
+        
+        elif view == "➕ Create Test":
             st.selectbox("Campaign Type", ["A/B Test Campaign"], disabled=True, key="ab_default")
             campaign_builder._render_ab_test_campaign()
         
-        with tab3:
-            analytics_dashboard = AnalyticsDashboard()
-            analytics_dashboard._render_ab_test_analytics({}, datetime.now().date() - timedelta(days=90), datetime.now().date())
+        else:
+            analytics_dashboard._render_ab_test_analytics({}, *self._today_range(90))
     
     def show_automation(self):
         """Show automation page"""
         
         st.title("🤖 Email Automation")
         
-        automation_builder = AutomationBuilder()
+        automation_builder = _get_automation_builder()
+        analytics_dashboard = _get_analytics_dashboard()
         
-        tab1, tab2, tab3 = st.tabs(["⚡ Active Automations", "➕ Create Automation", "📊 Performance"])
+        view = st.radio(
+            "View", ["⚡ Active Automations", "➕ Create Automation", "📊 Performance"],
+            horizontal=True, label_visibility="collapsed", key="automation_tab"
+        )
         
-        with tab1:
+        if view == "⚡ Active Automations":
             automation_builder.render_automation_management()
         
-        with tab2:
+        elif view == "➕ Create Automation":
             automation_builder.render()
         
-        with tab3:
-            analytics_dashboard = AnalyticsDashboard()
-            analytics_dashboard._render_performance_analytics({}, datetime.now().date() - timedelta(days=30), datetime.now().date())
+        else:
+            analytics_dashboard._render_performance_analytics({}, *self._today_range(30))
     
     def show_reports(self):
         """Show reports page"""
         
         st.title("📈 Reports & Insights")
         
-        tab1, tab2, tab3 = st.tabs(["📊 Overview", "📧 Email Reports", "👥 Audience Insights"])
+        view = st.radio(
+            "View", ["📊 Overview", "📧 Email Reports", "👥 Audience Insights"],
+            horizontal=True, label_visibility="collapsed", key="reports_tab"
+        )
         
-        with tab1:
+        if view == "📊 Overview":
             self._render_overview_report()
         
-        with tab2:
+        elif view == "📧 Email Reports":
             self._render_email_reports()
         
-        with tab3:
+        else:
             self._render_audience_insights()
     
     def show_settings(self):
@@ -180,29 +455,31 @@ class Dashboard:
         
         st.title("⚙️ Settings")
         
-        tab1, tab2, tab3, tab4 = st.tabs(["👤 Profile", "🔧 Email Setup", "🔐 Security", "🔗 Integrations"])
+        view = st.radio(
+            "View", ["👤 Profile", "🔧 Email Setup", "🔐 Security", "🔗 Integrations"],
+            horizontal=True, label_visibility="collapsed", key="settings_tab"
+        )
         
-        with tab1:
+        if view == "👤 Profile":
             self._render_profile_settings()
         
-        with tab2:
+        elif view == "🔧 Email Setup":
             self._render_email_settings()
         
-        with tab3:
+        elif view == "🔐 Security":
             self._render_security_settings()
         
-        with tab4:            self._render_integrations_settings()
+        else:
+            self._render_integrations_settings()
     
     def _render_key_metrics(self):
         """Render key performance metrics"""
         
         # Get metrics data with date range
-        from datetime import datetime, timedelta
-        end_date = datetime.now().date()
-        start_date = end_date - timedelta(days=30)
+        start_date, end_date = self._today_range(30)
         
         try:
-            metrics = self.analytics_service.get_dashboard_metrics(
+            metrics = _cached_dashboard_metrics(
                 st.session_state.get('user_id', 1), 
                 start_date, 
                 end_date
@@ -220,35 +497,23 @@ class Dashboard:
                 'click_rate_delta': 0.3
             }
         
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric(
-                label="📧 Total Campaigns",
-                value=metrics.get('total_campaigns', 0),
-                delta=metrics.get('campaigns_delta', 0)
-            )
-        
-        with col2:
-            st.metric(
-                label="📮 Emails Sent",
-                value=f"{metrics.get('emails_sent', 0):,}",
-                delta=metrics.get('emails_delta', 0)
-            )
-        
-        with col3:
-            st.metric(
-                label="📊 Open Rate",
-                value=f"{metrics.get('open_rate', 0):.1f}%",
-                delta=f"{metrics.get('open_rate_delta', 0):.1f}%"
-            )
+        kpis = (
+            ("📧 Total Campaigns", metrics.get('total_campaigns', 0), f"{metrics.get('campaigns_delta', 0):+}"),
+            ("📮 Emails Sent", f"{metrics.get('emails_sent', 0):,}", f"{metrics.get('emails_delta', 0):+,}"),
+            ("📊 Open Rate", f"{metrics.get('open_rate', 0):.1f}%", f"{metrics.get('open_rate_delta', 0):+.1f}%"),
+            ("🎯 Click Rate", f"{metrics.get('click_rate', 0):.1f}%", f"{metrics.get('click_rate_delta', 0):+.1f}%")
+        )
         
-        with col4:
-            st.metric(
-                label="🎯 Click Rate",
-                value=f"{metrics.get('click_rate', 0):.1f}%",
-                delta=f"{metrics.get('click_rate_delta', 0):.1f}%"
+        # All KPIs go out as one HTML block instead of four metric widgets
+        st.markdown(
+            '<div class="stats-container">'
+            + "".join(
+                f'<div class="metric-card" style="flex: 1;"><h4>{label}</h4><p>{value}</p><small>{delta}</small></div>'
+                for label, value, delta in kpis
             )
+            + '</div>',
+            unsafe_allow_html=True
+        )
     
     def _render_recent_campaigns(self):
         """Render recent campaigns"""
@@ -256,25 +521,35 @@ class Dashboard:
         st.subheader("🚀 Recent Campaigns")
         
         # Get recent campaigns
-        recent_campaigns = self.analytics_service.get_recent_campaigns(
+        recent_campaigns = _cached_recent_campaigns(
             st.session_state.get('user_id', 1), limit=5
         )
         
         if recent_campaigns:
-            for campaign in recent_campaigns:
-                with st.expander(f"📧 {campaign['name']}", expanded=False):
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.metric("Sent", campaign.get('sent_count', 0))
-                    with col2:
-                        st.metric("Opens", f"{campaign.get('open_rate', 0):.1f}%")
-                    with col3:
-                        st.metric("Clicks", f"{campaign.get('click_rate', 0):.1f}%")
-                    
-                    if st.button(f"View Details", key=f"view_{campaign['id']}"):
-                        st.session_state.selected_campaign = campaign['id']
-                        st.rerun()
+            import pandas as pd
+            
+            recent_df = pd.DataFrame(recent_campaigns).reindex(
+                columns=['id', 'name', 'sent_count', 'open_rate', 'click_rate']
+            ).fillna({'sent_count': 0, 'open_rate': 0, 'click_rate': 0})
+            
+            # One table for all rows; selecting a row picks the campaign
+            event = st.dataframe(
+                recent_df.drop(columns=['id']),
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    'name': "Campaign",
+                    'sent_count': st.column_config.NumberColumn("Sent"),
+                    'open_rate': st.column_config.NumberColumn("Opens", format="%.1f%%"),
+                    'click_rate': st.column_config.NumberColumn("Clicks", format="%.1f%%")
+                },
+                on_select="rerun",
+                selection_mode="single-row",
+                key="recent_campaigns"
+            )
+            
+            if event.selection.rows:
+                st.session_state.selected_campaign = recent_df['id'].iloc[event.selection.rows[0]]
         else:
             st.info("No campaigns yet. Create your first campaign to get started!")
     
@@ -284,47 +559,14 @@ class Dashboard:
         st.subheader("📈 Email Performance Trend")
         
         # Get performance data
-        performance_data = self.analytics_service.get_performance_trend(
+        performance_data = _cached_performance_trend(
             st.session_state.get('user_id', 1), days=30
         )
         
-        if performance_data and PLOTLY_AVAILABLE:
-            df = pd.DataFrame(performance_data)
-            
-            fig = go.Figure()
-            
-            fig.add_trace(go.Scatter(
-                x=df['date'],
-                y=df['sent'],
-                mode='lines+markers',
-                name='Emails Sent',
-                line=dict(color='#667eea')
-            ))
-            
-            fig.add_trace(go.Scatter(
-                x=df['date'],
-                y=df['opened'],
-                mode='lines+markers',
-                name='Opened',
-                line=dict(color='#28a745')
-            ))
-            
-            fig.add_trace(go.Scatter(
-                x=df['date'],
-                y=df['clicked'],
-                mode='lines+markers',
-                name='Clicked',
-                line=dict(color='#ffc107')
-            ))
-            
-            fig.update_layout(
-                title="Email Performance (Last 30 Days)",
-                xaxis_title="Date",
-                yaxis_title="Count",
-                height=300
-            )
+        if performance_data and _plotly()[1] is not None:
+            fig = _build_performance_figure(performance_data)
             
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, use_container_width=True, key="dash_perf_chart")
         else:
             st.info("No performance data available yet or Plotly not installed.")
     
@@ -333,28 +575,11 @@ class Dashboard:
         
         st.subheader("🎯 Activity Overview")
         
-        # Sample data - replace with real data
-        activities = {
-            'Campaigns Created': 12,
-            'Emails Sent': 1250,
-            'Templates Created': 8,
-            'Contacts Added': 340
-        }
-        
-        if PLOTLY_AVAILABLE:
-            fig = px.pie(
-                values=list(activities.values()),
-                names=list(activities.keys()),
-                title="Activity Distribution"
-            )
-            
-            fig.update_traces(textposition='inside', textinfo='percent+label')
-            fig.update_layout(height=300)
-            
-            st.plotly_chart(fig, use_container_width=True)
+        if _plotly()[0] is not None:
+            st.plotly_chart(_activity_pie(), use_container_width=True, key="dash_activity_chart")
         else:
             st.write("**Activity Distribution:**")
-            for activity, count in activities.items():
+            for activity, count in zip(_ACTIVITY_NAMES, _ACTIVITY_VALUES):
                 st.write(f"• {activity}: {count}")
     
     def _render_quick_actions(self):
@@ -364,23 +589,20 @@ class Dashboard:
         
         col1, col2 = st.columns(2)
         
+        # Navigation happens in the click callback, before the rerun the click triggers
         with col1:
-            if st.button("📧 New Campaign", use_container_width=True):
-                st.session_state.current_page = "Campaigns"
-                st.rerun()
+            st.button("📧 New Campaign", use_container_width=True,
+                      on_click=_navigate_to, args=("Campaigns",))
             
-            if st.button("👥 Import Contacts", use_container_width=True):
-                st.session_state.current_page = "Contacts"
-                st.rerun()
+            st.button("👥 Import Contacts", use_container_width=True,
+                      on_click=_navigate_to, args=("Contacts",))
         
         with col2:
-            if st.button("📝 New Template", use_container_width=True):
-                st.session_state.current_page = "Templates"
-                st.rerun()
+            st.button("📝 New Template", use_container_width=True,
+                      on_click=_navigate_to, args=("Templates",))
             
-            if st.button("📊 View Analytics", use_container_width=True):
-                st.session_state.current_page = "Analytics"
-                st.rerun()
+            st.button("📊 View Analytics", use_container_width=True,
+                      on_click=_navigate_to, args=("Analytics",))
     
     def _render_campaigns_list(self):
         """Render campaigns list"""
@@ -404,107 +626,146 @@ class Dashboard:
             search_term = st.text_input("🔍 Search campaigns", placeholder="Search...")
         
         # Get campaigns data
-        campaigns = self.analytics_service.get_campaigns_list(
+        date_filter_days = _DATE_FILTER_DAYS.get(date_filter)
+        campaigns = _cached_campaigns_list(
             st.session_state.user_id,
             status_filter=status_filter.lower() if status_filter != "All" else None,
-            search_term=search_term
+            search_term=search_term,
+            created_after=self._today_range(date_filter_days)[0] if date_filter_days else None
         )
         
         if campaigns:
-            # Display campaigns in a table format
-            for campaign in campaigns:
-                with st.container():
-                    st.markdown(f"""
-                    <div class="campaign-card">
-                        <h4>{campaign['name']}</h4>
-                        <p><strong>Subject:</strong> {campaign['subject']}</p>
-                        <p><strong>Status:</strong> <span style="color: {'green' if campaign['status'] == 'sent' else 'orange'}">{campaign['status'].title()}</span></p>
-                        <p><strong>Created:</strong> {campaign['created_at']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        st.metric("Sent", campaign.get('sent_count', 0))
-                    with col2:
-                        st.metric("Delivered", campaign.get('delivered_count', 0))
-                    with col3:
-                        st.metric("Opened", campaign.get('opened_count', 0))
-                    with col4:
-                        st.metric("Clicked", campaign.get('clicked_count', 0))
-                    
-                    # Action buttons
-                    action_col1, action_col2, action_col3, action_col4 = st.columns(4)
-                    
-                    with action_col1:
-                        if st.button("👁️ View", key=f"view_{campaign['id']}"):
-                            st.session_state.selected_campaign = campaign['id']
-                    
-                    with action_col2:
-                        if st.button("✏️ Edit", key=f"edit_{campaign['id']}"):
-                            st.session_state.edit_campaign = campaign['id']
-                    
-                    with action_col3:
-                        if st.button("📊 Analytics", key=f"analytics_{campaign['id']}"):
-                            st.session_state.campaign_analytics = campaign['id']
-                    
-                    with action_col4:
-                        if campaign['status'] == 'draft':
-                            if st.button("🚀 Send", key=f"send_{campaign['id']}"):
-                                self._send_campaign(campaign['id'])
-                    
-                    st.markdown("---")
+            # Display campaigns in a single table
+            import pandas as pd
+            
+            campaigns_df = pd.DataFrame(campaigns).reindex(columns=_CAMPAIGN_TABLE_COLUMNS)
+            count_columns = ['sent_count', 'delivered_count', 'opened_count', 'clicked_count']
+            campaigns_df[count_columns] = campaigns_df[count_columns].fillna(0).astype(int)
+            # Dictionary-encoded columns keep the Arrow payload small for long lists
+            campaigns_df['status'] = campaigns_df['status'].str.title().astype('category')
+            campaigns_df['name'] = campaigns_df['name'].astype('string[pyarrow]')
+            
+            st.dataframe(
+                campaigns_df.drop(columns=['id']),
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    'name': "Name",
+                    'subject': "Subject",
+                    'status': "Status",
+                    'sent_count': st.column_config.NumberColumn("Sent"),
+                    'delivered_count': st.column_config.NumberColumn("Delivered"),
+                    'opened_count': st.column_config.NumberColumn("Opened"),
+                    'clicked_count': st.column_config.NumberColumn("Clicked"),
+                    'created_at': "Created"
+                }
+            )
+            
+            # Actions for the selected campaign
+            campaign_names = dict(zip(campaigns_df['id'], campaigns_df['name']))
+            campaign_status = dict(zip(campaigns_df['id'], campaigns_df['status']))
+            
+            self._render_campaign_actions(campaign_names, campaign_status)
         else:
             st.info("No campaigns found. Create your first campaign to get started!")
     
+    @st.fragment
+    def _render_campaign_actions(self, campaign_names: Dict[str, str], campaign_status: Dict[str, str]):
+        """Render the action row for the selected campaign"""
+        
+        action_col1, action_col2, action_col3 = st.columns([2, 1, 1])
+        
+        with action_col1:
+            selected_id = st.selectbox(
+                "Campaign",
+                list(campaign_names),
+                format_func=campaign_names.get,
+                key="campaigns_list_selected_row"
+            )
+        
+        with action_col2:
+            action = st.selectbox("Action", list(_CAMPAIGN_ACTIONS) + ["🚀 Send"], key="campaigns_list_action_choice")
+        
+        with action_col3:
+            st.write("")
+            if st.button("Go", key="campaigns_list_action", use_container_width=True):
+                if action in _CAMPAIGN_ACTIONS:
+                    st.session_state.update({_CAMPAIGN_ACTIONS[action]: selected_id, 'pending_action': action})
+                elif campaign_status[selected_id] == 'Draft':
+                    with st.spinner("Sending campaign..."):
+                        result = self.email_service.send_campaign(int(selected_id))
+                    
+                    if result['success']:
+                        # Status and counts changed, so cached lists are stale
+                        _cached_campaigns_list.clear()
+                        _cached_recent_campaigns.clear()
+                        st.success(f"Campaign sent successfully to {result['sent_count']} recipients!")
+                    else:
+                        st.error(f"Campaign failed: {result['error']}")
+                else:
+                    st.warning("Only draft campaigns can be sent")
+    
     def _render_campaign_performance(self):
         """Render campaign performance analytics"""
         
         st.subheader("📈 Campaign Performance Analysis")
         
         # Performance metrics
-        performance_data = self.analytics_service.get_campaign_performance(st.session_state.user_id)
+        start_date, end_date = self._today_range(30)
+        performance_data = _cached_campaign_performance(
+            st.session_state.user_id, start_date, end_date
+        )
         
         if performance_data:
+            import pandas as pd
+            px, _ = _plotly()
+            
+            # One row per campaign; averages are weighted by emails sent
+            campaigns_df = pd.DataFrame(performance_data)
+            total_sent = campaigns_df['sent_count'].sum()
+            
+            def weighted_rate(column: str) -> float:
+                if not total_sent:
+                    return 0.0
+                return float((campaigns_df[column] * campaigns_df['sent_count']).sum() / total_sent)
+            
             # Performance overview
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                avg_open_rate = performance_data.get('avg_open_rate', 0)
-                st.metric("Avg Open Rate", f"{avg_open_rate:.1f}%")
+                st.metric("Avg Open Rate", f"{weighted_rate('open_rate'):.1f}%")
             
             with col2:
-                avg_click_rate = performance_data.get('avg_click_rate', 0)
-                st.metric("Avg Click Rate", f"{avg_click_rate:.1f}%")
+                st.metric("Avg Click Rate", f"{weighted_rate('click_rate'):.1f}%")
             
             with col3:
-                avg_bounce_rate = performance_data.get('avg_bounce_rate', 0)
-                st.metric("Avg Bounce Rate", f"{avg_bounce_rate:.1f}%")
+                st.metric("Avg Bounce Rate", f"{weighted_rate('bounce_rate'):.1f}%")
             
             with col4:
-                total_revenue = performance_data.get('total_revenue', 0)
-                st.metric("Total Revenue", f"${total_revenue:,.2f}")
+                st.metric("Campaigns", len(campaigns_df))
             
             # Performance comparison chart
             st.subheader("📊 Campaign Comparison")
             
-            campaigns_df = pd.DataFrame(performance_data.get('campaigns', []))
+            sent_df = campaigns_df[campaigns_df['sent_count'] > 0]
             
-            if not campaigns_df.empty:
+            if not sent_df.empty and px is not None:
                 fig = px.scatter(
-                    campaigns_df,
+                    sent_df,
                     x='open_rate',
                     y='click_rate',
                     size='sent_count',
-                    hover_data=['name', 'sent_count'],
-                    title="Campaign Performance: Open Rate vs Click Rate"
+                    hover_data=['campaign_name', 'sent_count'],
+                    title="Campaign Performance: Open Rate vs Click Rate",
+                    render_mode='webgl'
                 )
+                fig.update_layout(hovermode='x', spikedistance=0)
                 
                 st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No performance data available yet.")
     
+    @st.fragment
     def _render_templates_list(self):
         """Render templates list"""
         
@@ -537,28 +798,40 @@ class Dashboard:
         )
         
         if templates:
-            # Display templates in grid
-            cols = st.columns(3)
-            
-            for idx, template in enumerate(templates):
-                with cols[idx % 3]:
-                    st.markdown(f"""
-                    <div style="border: 1px solid #ddd; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;">
-                        <h5>{template['name']}</h5>
-                        <p><strong>Category:</strong> {template.get('category', 'General')}</p>
-                        <p><strong>Created:</strong> {template['created_at']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        if st.button("👁️ Preview", key=f"preview_{template['id']}"):
-                            st.session_state.preview_template = template['id']
-                    
-                    with col2:
-                        if st.button("✏️ Edit", key=f"edit_template_{template['id']}"):
-                            st.session_state.edit_template = template['id']
+            # Display templates in a single grid block
+            cards = "".join(
+                _TEMPLATE_CARD_TPL.format_map({
+                    'name': escape(template['name']),
+                    'category': escape(str(template.get('category', 'General'))),
+                    'created_at': escape(str(template['created_at']))
+                })
+                for template in templates
+            )
+            st.markdown(_GRID_TPL.format_map({'cards': cards}), unsafe_allow_html=True)
+            
+            # Actions for the selected template
+            template_names = {template['id']: template['name'] for template in templates}
+            
+            col1, col2, col3 = st.columns([2, 1, 1])
+            
+            with col1:
+                selected_id = st.selectbox(
+                    "Template",
+                    list(template_names),
+                    format_func=template_names.get,
+                    key="templates_list_selected"
+                )
+            
+            with col2:
+                if st.button("👁️ Preview", key="preview_selected_template", use_container_width=True):
+                    st.session_state.preview_template = selected_id
+                    # The template editor tab reads this, so rerun the whole app, not just the fragment
+                    st.rerun(scope="app")
+            
+            with col3:
+                if st.button("✏️ Edit", key="edit_selected_template", use_container_width=True):
+                    st.session_state.edit_template = selected_id
+                    st.rerun(scope="app")
         else:
             st.info("No templates found. Create your first template to get started!")
     
@@ -568,53 +841,21 @@ class Dashboard:
         st.subheader("🎨 Template Gallery")
         st.info("Browse our collection of professionally designed email templates")
         
-        # Predefined template categories
-        categories = [
-            {
-                "name": "Welcome Series",
-                "templates": [
-                    {"name": "Simple Welcome", "description": "Clean and simple welcome email"},
-                    {"name": "Product Welcome", "description": "Welcome with product highlights"},
-                    {"name": "Service Welcome", "description": "Service-focused welcome email"}
-                ]
-            },
-            {
-                "name": "Newsletter",
-                "templates": [
-                    {"name": "Modern Newsletter", "description": "Contemporary newsletter design"},
-                    {"name": "Corporate Newsletter", "description": "Professional corporate style"},
-                    {"name": "Creative Newsletter", "description": "Creative and colorful design"}
-                ]
-            },
-            {
-                "name": "Promotional",
-                "templates": [
-                    {"name": "Sale Announcement", "description": "Eye-catching sale promotion"},
-                    {"name": "Product Launch", "description": "New product announcement"},
-                    {"name": "Event Invitation", "description": "Professional event invite"}
-                ]
-            }
-        ]
+        st.markdown(_gallery_html(), unsafe_allow_html=True)
         
-        for category in categories:
-            st.subheader(f"📁 {category['name']}")
-            
-            cols = st.columns(3)
-            
-            for idx, template in enumerate(category['templates']):
-                with cols[idx % 3]:
-                    st.markdown(f"""
-                    <div style="border: 1px solid #ddd; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;">
-                        <h6>{template['name']}</h6>
-                        <p>{template['description']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    if st.button(f"Use Template", key=f"use_{category['name']}_{idx}"):
-                        # Create new template based on predefined template
-                        st.session_state.create_from_template = template['name']
-                        st.info(f"Creating new template based on '{template['name']}'...")
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            selected_name = st.selectbox("Gallery template", _GALLERY_TEMPLATE_NAMES, key="gallery_template_selected")
+        
+        with col2:
+            st.write("")
+            if st.button("Use selected", key="use_gallery_template", use_container_width=True):
+                # Create new template based on predefined template
+                st.session_state.create_from_template = selected_name
+                st.info(f"Creating new template based on '{selected_name}'...")
     
+    @st.fragment
     def _render_overview_report(self):
         """Render overview report"""
         
@@ -632,16 +873,8 @@ class Dashboard:
         # Overview metrics
         st.markdown("### Key Metrics")
         
-        metrics = {
-            "Total Campaigns": 25,
-            "Emails Sent": 12500,
-            "Average Open Rate": "24.5%",
-            "Average Click Rate": "3.2%",
-            "Total Revenue": "$15,750"
-        }
-        
-        cols = st.columns(len(metrics))
-        for i, (metric, value) in enumerate(metrics.items()):
+        cols = st.columns(len(_OVERVIEW_METRICS))
+        for i, (metric, value) in enumerate(_OVERVIEW_METRICS):
             with cols[i]:
                 st.metric(metric, value)
         
@@ -653,12 +886,14 @@ class Dashboard:
         st.subheader("📧 Email Reports")
         st.info("Email-specific reports coming soon!")
     
+    @st.fragment
     def _render_audience_insights(self):
         """Render audience insights"""
         
         st.subheader("👥 Audience Insights")
         st.info("Audience insights coming soon!")
     
+    @st.fragment
     def _render_profile_settings(self):
         """Render profile settings"""
         
@@ -681,6 +916,7 @@ class Dashboard:
             if st.form_submit_button("Update Profile"):
                 st.success("Profile updated successfully!")
     
+    @st.fragment
     def _render_email_settings(self):
         """Render email settings"""
         
@@ -708,6 +944,7 @@ class Dashboard:
         if st.button("Save Email Settings"):
             st.success("Email settings saved successfully!")
     
+    @st.fragment
     def _render_security_settings(self):
         """Render security settings"""
         
@@ -736,6 +973,7 @@ class Dashboard:
             if st.button("Setup 2FA"):
                 st.info("2FA setup coming soon!")
     
+    @st.fragment
     def _render_integrations_settings(self):
         """Render integrations settings"""
         
@@ -1,6 +1,9 @@
 import streamlit as st
 from typing import Optional
 
+# Sidebar title and divider, sent as one markdown element
+_HEADER_MARKDOWN = "# 📨 Email Marketing\n\n---"
+
 class Sidebar:
     """Sidebar navigation component"""
     
@@ -17,18 +20,18 @@ class Sidebar:
             {"name": "Reports", "icon": "📈"},
             {"name": "Settings", "icon": "⚙️"}
         ]
+        self._nav_names = tuple(item['name'] for item in self.navigation_items)
     
     def render(self) -> Optional[str]:
         """Render sidebar navigation"""
         
         with st.sidebar:
-            st.title("📨 Email Marketing")
-            st.markdown("---")
+            st.markdown(_HEADER_MARKDOWN)
             
             # Navigation menu using selectbox
             selected_page = st.selectbox(
                 "Navigate to:",
-                [item['name'] for item in self.navigation_items],
+                self._nav_names,
                 index=0,
                 key="navigation_select"
             )
@@ -41,8 +44,7 @@ class Sidebar:
                 
                 if st.button("🚪 Logout", use_container_width=True):
                     # Clear session state
-                    for key in list(st.session_state.keys()):
-                        del st.session_state[key]
+                    st.session_state.clear()
                     st.rerun()
             else:
                 st.write("👤 **Guest User**")
@@ -1,5 +1,13 @@
 import os
 import secrets
+import hashlib
+import time
+import threading
+from datetime import timezone
+import requests
+from cachetools import TLRUCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 # Optional Google OAuth imports
@@ -14,6 +22,27 @@ except ImportError:
 
 load_dotenv()
 
+# Google API endpoint for the signed-in user's profile
+_USERINFO_URL = 'https://www.googleapis.com/oauth2/v2/userinfo'
+
+# Shared HTTP session so the TLS connection to Google is reused across logins
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=2, backoff_factor=0.1))
+)
+
+def _userinfo_expiry(key, value, now):
+    """Expiry time for an (expires_at, data) userinfo entry"""
+    return value[0]
+
+# Userinfo responses keyed by SHA-256 of the access token, stored as (expires_at, data);
+# expires_at is wall-clock epoch seconds, so the cache runs on time.time
+_USERINFO_CACHE = TLRUCache(maxsize=512, ttu=_userinfo_expiry, timer=time.time)
+_USERINFO_LOCK = threading.Lock()
+# Lifetime for cached userinfo when the credentials carry no expiry
+_USERINFO_DEFAULT_TTL = 300
+
 class GoogleOAuth:
     """Google OAuth handler for authentication"""
     
@@ -24,6 +53,8 @@ class GoogleOAuth:
             self.client_secret = None
             self.redirect_uri = None
             self.scopes = []
+            self._scopes_tuple = ()
+            self._client_config = None
             return
             
         self.client_id = os.getenv('GOOGLE_CLIENT_ID')
@@ -35,6 +66,18 @@ class GoogleOAuth:
             'email',            'profile',
             'https://www.googleapis.com/auth/gmail.send'
         ]
+        self._scopes_tuple = tuple(self.scopes)
+        
+        # Client config is fixed for the app, so build it once for every Flow
+        self._client_config = {
+            "web": {
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+                "token_uri": "https://oauth2.googleapis.com/token",
+                "redirect_uris": [self.redirect_uri]
+            }
+        }
     
     def get_auth_url(self) -> str:
         """Get Google OAuth authorization URL"""
@@ -45,18 +88,7 @@ class GoogleOAuth:
         if not self.client_id or not self.client_secret:
             raise ValueError("Google OAuth credentials not configured")
         
-        flow = Flow.from_client_config(
-            {
-                "web": {
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                    "token_uri": "https://oauth2.googleapis.com/token",
-                    "redirect_uris": [self.redirect_uri]
-                }
-            },
-            scopes=self.scopes
-        )
+        flow = Flow.from_client_config(self._client_config, scopes=self._scopes_tuple)
         
         flow.redirect_uri = self.redirect_uri
           # Generate state parameter for security
@@ -76,18 +108,7 @@ class GoogleOAuth:
         if not GOOGLE_OAUTH_AVAILABLE:
             raise ValueError("Google OAuth libraries not available")
         
-        flow = Flow.from_client_config(
-            {
-                "web": {
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                    "token_uri": "https://oauth2.googleapis.com/token",
-                    "redirect_uris": [self.redirect_uri]
-                }
-            },
-            scopes=self.scopes
-        )
+        flow = Flow.from_client_config(self._client_config, scopes=self._scopes_tuple)
         
         flow.redirect_uri = self.redirect_uri
         
@@ -107,17 +128,30 @@ class GoogleOAuth:
     def _get_user_info(self, creds) -> dict:
         """Get user information from Google"""
         
-        import requests
+        # Reuse the profile fetched for this token while the token is still valid
+        token_key = hashlib.sha256(creds.token.encode()).hexdigest()
+        with _USERINFO_LOCK:
+            cached = _USERINFO_CACHE.get(token_key)
+        if cached:
+            return cached[1]
         
         # Use the credentials to make an API call
         headers = {'Authorization': f'Bearer {creds.token}'}
-        response = requests.get(
-            'https://www.googleapis.com/oauth2/v2/userinfo',
-            headers=headers
-        )
+        response = _SESSION.get(_USERINFO_URL, headers=headers, timeout=5)
         
         if response.status_code == 200:
-            return response.json()
+            user_info = response.json()
+            
+            # google-auth reports expiry as a naive UTC datetime
+            if creds.expiry:
+                expires_at = creds.expiry.replace(tzinfo=timezone.utc).timestamp()
+            else:
+                expires_at = time.time() + _USERINFO_DEFAULT_TTL
+            
+            with _USERINFO_LOCK:
+                _USERINFO_CACHE[token_key] = (expires_at, user_info)
+            
+            return user_info
         else:
             raise Exception(f"Failed to get user info: {response.status_code}")
     
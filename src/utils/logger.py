@@ -1,5 +1,9 @@
 import logging
 import os
+import atexit
+import threading
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+from queue import Queue
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -13,8 +17,23 @@ except ImportError:
 
 load_dotenv()
 
+# Background listener that owns the file and console handlers; started once per process
+_queue_listener = None
+
+# Buffered file records are flushed at least this often, in seconds
+_FLUSH_INTERVAL = 1.0
+
+# Set at exit to stop the periodic flush thread
+_flush_stop = threading.Event()
+
+def _flush_periodically(handler: logging.Handler):
+    """Flush a buffering handler every interval until stopped"""
+    while not _flush_stop.wait(_FLUSH_INTERVAL):
+        handler.flush()
+
 def setup_logging():
     """Setup logging configuration"""
+    global _queue_listener
     
     # Create logs directory if it doesn't exist
     logs_dir = "logs"
@@ -28,15 +47,43 @@ def setup_logging():
     # Setup file handler
     log_filename = os.path.join(logs_dir, f"email_sender_{datetime.now().strftime('%Y_%m_%d')}.log")
     
-    logging.basicConfig(
-        level=logging.INFO,
-        format=log_format,
-        datefmt=date_format,
-        handlers=[
-            logging.FileHandler(log_filename),
-            logging.StreamHandler()  # Console output
-        ]
-    )
+    # Callers only enqueue records; the listener thread does the file and console writes
+    if _queue_listener is None:
+        formatter = logging.Formatter(log_format, datefmt=date_format)
+        
+        file_handler = logging.FileHandler(log_filename)
+        file_handler.setFormatter(formatter)
+        
+        # Batch file writes; errors are written through immediately
+        buffered_file_handler = MemoryHandler(
+            capacity=512,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True
+        )
+        
+        stream_handler = logging.StreamHandler()  # Console output
+        stream_handler.setFormatter(formatter)
+        
+        log_queue = Queue(-1)
+        root_logger = logging.getLogger()
+        root_logger.setLevel(logging.INFO)
+        root_logger.addHandler(QueueHandler(log_queue))
+        
+        _queue_listener = QueueListener(log_queue, buffered_file_handler, stream_handler, respect_handler_level=True)
+        _queue_listener.start()
+        threading.Thread(
+            target=_flush_periodically,
+            args=(buffered_file_handler,),
+            name="log-flush",
+            daemon=True
+        ).start()
+        
+        # atexit runs in reverse order: stop the flush thread, drain the queue, then flush the buffer
+        atexit.register(buffered_file_handler.close)
+        atexit.register(_queue_listener.stop)
+        atexit.register(_flush_stop.set)
+    
       # Setup Sentry for error monitoring (if configured and available)
     sentry_dsn = os.getenv('SENTRY_DSN')
     if sentry_dsn and SENTRY_AVAILABLE:
@@ -75,125 +122,149 @@ class EmailSenderLogger:
     
     def log_user_action(self, user_id: int, action: str, details: dict = None):
         """Log user actions"""
-        log_message = f"User {user_id} performed action: {action}"
-        if details:
-            log_message += f" | Details: {details}"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         
-        self.logger.info(log_message)
+        if details:
+            self.logger.info("User %s performed action: %s | Details: %s", user_id, action, details)
+        else:
+            self.logger.info("User %s performed action: %s", user_id, action)
     
     def log_email_sent(self, campaign_id: int, recipient_email: str, status: str):
         """Log email sending events"""
         self.logger.info(
-            f"Email sent - Campaign: {campaign_id}, "
-            f"Recipient: {recipient_email}, Status: {status}"
+            "Email sent - Campaign: %s, Recipient: %s, Status: %s",
+            campaign_id, recipient_email, status
         )
     
     def log_campaign_created(self, user_id: int, campaign_id: int, campaign_name: str):
         """Log campaign creation"""
         self.logger.info(
-            f"Campaign created - User: {user_id}, "
-            f"Campaign ID: {campaign_id}, Name: {campaign_name}"
+            "Campaign created - User: %s, Campaign ID: %s, Name: %s",
+            user_id, campaign_id, campaign_name
         )
     
     def log_template_created(self, user_id: int, template_id: int, template_name: str):
         """Log template creation"""
         self.logger.info(
-            f"Template created - User: {user_id}, "
-            f"Template ID: {template_id}, Name: {template_name}"
+            "Template created - User: %s, Template ID: %s, Name: %s",
+            user_id, template_id, template_name
         )
     
     def log_contact_imported(self, user_id: int, count: int, source: str):
         """Log contact import"""
         self.logger.info(
-            f"Contacts imported - User: {user_id}, "
-            f"Count: {count}, Source: {source}"
+            "Contacts imported - User: %s, Count: %s, Source: %s",
+            user_id, count, source
         )
     
     def log_authentication(self, email: str, success: bool, ip_address: str = None):
         """Log authentication attempts"""
+        level = logging.INFO if success else logging.WARNING
+        if not self.logger.isEnabledFor(level):
+            return
+        
         status = "successful" if success else "failed"
-        log_message = f"Authentication {status} - Email: {email}"
         
         if ip_address:
-            log_message += f", IP: {ip_address}"
-        
-        if success:
-            self.logger.info(log_message)
+            self.logger.log(level, "Authentication %s - Email: %s, IP: %s", status, email, ip_address)
         else:
-            self.logger.warning(log_message)
+            self.logger.log(level, "Authentication %s - Email: %s", status, email)
     
     def log_error(self, error_type: str, error_message: str, user_id: int = None, 
                   additional_context: dict = None):
         """Log application errors"""
-        log_message = f"Error - Type: {error_type}, Message: {error_message}"
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+        
+        log_format = "Error - Type: %s, Message: %s"
+        args = [error_type, error_message]
         
         if user_id:
-            log_message += f", User: {user_id}"
+            log_format += ", User: %s"
+            args.append(user_id)
         
         if additional_context:
-            log_message += f", Context: {additional_context}"
+            log_format += ", Context: %s"
+            args.append(additional_context)
         
-        self.logger.error(log_message)
+        self.logger.error(log_format, *args)
     
     def log_api_call(self, endpoint: str, method: str, status_code: int, 
                      response_time: float, user_id: int = None):
         """Log API calls"""
-        log_message = (
-            f"API Call - Endpoint: {endpoint}, Method: {method}, "
-            f"Status: {status_code}, Response Time: {response_time:.3f}s"
-        )
+        level = logging.WARNING if status_code >= 400 else logging.INFO
+        if not self.logger.isEnabledFor(level):
+            return
         
         if user_id:
-            log_message += f", User: {user_id}"
-        
-        if status_code >= 400:
-            self.logger.warning(log_message)
+            self.logger.log(
+                level,
+                "API Call - Endpoint: %s, Method: %s, Status: %s, Response Time: %.3fs, User: %s",
+                endpoint, method, status_code, response_time, user_id
+            )
         else:
-            self.logger.info(log_message)
+            self.logger.log(
+                level,
+                "API Call - Endpoint: %s, Method: %s, Status: %s, Response Time: %.3fs",
+                endpoint, method, status_code, response_time
+            )
     
     def log_database_operation(self, operation: str, table: str, affected_rows: int = None,
                               execution_time: float = None):
         """Log database operations"""
-        log_message = f"DB Operation - {operation} on {table}"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        log_format = "DB Operation - %s on %s"
+        args = [operation, table]
         
         if affected_rows is not None:
-            log_message += f", Affected rows: {affected_rows}"
+            log_format += ", Affected rows: %s"
+            args.append(affected_rows)
         
         if execution_time is not None:
-            log_message += f", Execution time: {execution_time:.3f}s"
+            log_format += ", Execution time: %.3fs"
+            args.append(execution_time)
         
-        self.logger.info(log_message)
+        self.logger.info(log_format, *args)
     
     def log_email_provider_interaction(self, provider: str, action: str, 
                                      success: bool, response_data: dict = None):
         """Log email provider interactions"""
+        level = logging.INFO if success else logging.ERROR
+        if not self.logger.isEnabledFor(level):
+            return
+        
         status = "successful" if success else "failed"
-        log_message = f"Email Provider - {provider}: {action} {status}"
         
         if response_data:
-            log_message += f", Response: {response_data}"
-        
-        if success:
-            self.logger.info(log_message)
+            self.logger.log(level, "Email Provider - %s: %s %s, Response: %s", provider, action, status, response_data)
         else:
-            self.logger.error(log_message)
+            self.logger.log(level, "Email Provider - %s: %s %s", provider, action, status)
     
     def log_security_event(self, event_type: str, details: dict, user_id: int = None,
                           ip_address: str = None):
         """Log security-related events"""
-        log_message = f"Security Event - {event_type}: {details}"
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
+        
+        log_format = "Security Event - %s: %s"
+        args = [event_type, details]
         
         if user_id:
-            log_message += f", User: {user_id}"
+            log_format += ", User: %s"
+            args.append(user_id)
         
         if ip_address:
-            log_message += f", IP: {ip_address}"
+            log_format += ", IP: %s"
+            args.append(ip_address)
         
-        self.logger.warning(log_message)
+        self.logger.warning(log_format, *args)
     
     def log_performance_metric(self, metric_name: str, value: float, unit: str = "ms"):
         """Log performance metrics"""
-        self.logger.info(f"Performance - {metric_name}: {value}{unit}")
+        self.logger.info("Performance - %s: %s%s", metric_name, value, unit)
     
     def info(self, message: str):
         """Log info message"""
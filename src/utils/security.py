@@ -1,17 +1,81 @@
 import os
+import re
 import secrets
+import base64
+import struct
+import time
+import json
+import threading
+from calendar import timegm
+from typing import List
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes, padding
+from cryptography.hazmat.primitives import hmac as crypto_hmac
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from dotenv import load_dotenv
 import hashlib
+import hmac
 import jwt
+from jwt.algorithms import get_default_algorithms
 from datetime import datetime, timedelta
+from functools import lru_cache
 import bcrypt
+from cachetools import TLRUCache
+
+# Native HTML sanitizer; bleach is used as a fallback when nh3 is not installed
+try:
+    import nh3
+except ImportError:
+    nh3 = None
 
 load_dotenv()
 
+# Tags kept by sanitize_input; everything else is stripped
+_ALLOWED_TAGS = frozenset({'b', 'i', 'u', 'em', 'strong', 'p', 'br'})
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as JWT segments require"""
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+# Encoded JWT header shared by every token this module signs
+_JWT_HEADER_SEGMENT = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+
+# Registered claims PyJWT converts from datetime to a Unix timestamp
+_JWT_TIME_CLAIMS = ('exp', 'iat', 'nbf')
+
+# File extensions accepted by validate_file_upload by default
+_DEFAULT_ALLOWED = frozenset({'pdf', 'doc', 'docx', 'txt', 'jpg', 'jpeg', 'png', 'gif'})
+
+def _rate_window_end(key, value, now):
+    """Expiry time for a (window_end, count) rate limit entry"""
+    return value[0]
+
+# Request counts per (identifier, window) for rate_limit_check; dropped when the window ends
+_RL = TLRUCache(maxsize=10000, ttu=_rate_window_end)
+_RL_LOCK = threading.Lock()
+
+# Fernet ciphers shared across SecurityManager instances, keyed by encryption key
+_CIPHER_CACHE = {}
+
+def _get_cipher(encryption_key: str) -> Fernet:
+    """Get the shared Fernet cipher for an encryption key"""
+    cipher = _CIPHER_CACHE.get(encryption_key)
+    if cipher is None:
+        cipher = _CIPHER_CACHE[encryption_key] = Fernet(encryption_key.encode())
+    return cipher
+
 class SecurityManager:
     """Handles security operations for the application"""
     
+    # Script injection patterns rejected in email content
+    _XSS_RE = re.compile(
+        r"<script|javascript:|onload=|onerror=|onclick=|eval\(|document\.cookie",
+        re.IGNORECASE
+    )
+    
+    # Signatures of executable content rejected in uploaded files
+    _DANGER_RE = re.compile(rb"<script|javascript:|<\?php|<%|<iframe", re.IGNORECASE)
+    
     def __init__(self):
         self._secret_key = os.getenv('SECRET_KEY', self._generate_secret_key())
         encryption_key = os.getenv('ENCRYPTION_KEY')
@@ -19,16 +83,20 @@ class SecurityManager:
         if encryption_key:
             # If key exists, validate and use it
             try:
-                self._cipher_suite = Fernet(encryption_key.encode())
+                self._cipher_suite = _get_cipher(encryption_key)
                 self._encryption_key = encryption_key
             except Exception:
                 # If key is invalid, generate a new one
                 self._encryption_key = self._generate_encryption_key()
-                self._cipher_suite = Fernet(self._encryption_key.encode())
+                self._cipher_suite = _get_cipher(self._encryption_key)
         else:
             # Generate new key if not exists
             self._encryption_key = self._generate_encryption_key()
-            self._cipher_suite = Fernet(self._encryption_key.encode())
+            self._cipher_suite = _get_cipher(self._encryption_key)
+        
+        # HS256 signer and key prepared once for create_jwt_token
+        self._jwt_alg = get_default_algorithms()['HS256']
+        self._jwt_key = self._jwt_alg.prepare_key(self._secret_key)
     
     def get_secret_key(self) -> str:
         """Get the application secret key"""
@@ -54,13 +122,45 @@ class SecurityManager:
         except Exception as e:
             raise ValueError(f"Decryption failed: {str(e)}")
     
+    def encrypt_many(self, values: List[str]) -> List[str]:
+        """Encrypt many values into Fernet tokens that decrypt_data accepts"""
+        try:
+            # Key split, HMAC key setup and timestamp are shared by the whole batch
+            key = base64.urlsafe_b64decode(self._encryption_key)
+            signing_key, encryption_key = key[:16], key[16:]
+            base_hmac = crypto_hmac.HMAC(signing_key, hashes.SHA256())
+            aes = algorithms.AES(encryption_key)
+            header = b'\x80' + struct.pack('>Q', int(time.time()))
+            
+            tokens = []
+            for value in values:
+                iv = os.urandom(16)
+                padder = padding.PKCS7(algorithms.AES.block_size).padder()
+                padded = padder.update(value.encode()) + padder.finalize()
+                encryptor = Cipher(aes, modes.CBC(iv)).encryptor()
+                basic_parts = header + iv + encryptor.update(padded) + encryptor.finalize()
+                
+                signer = base_hmac.copy()
+                signer.update(basic_parts)
+                tokens.append(base64.urlsafe_b64encode(basic_parts + signer.finalize()).decode())
+            
+            return tokens
+        except Exception as e:
+            raise ValueError(f"Encryption failed: {str(e)}")
+    
     def hash_api_key(self, api_key: str) -> str:
         """Hash API key for secure storage"""
         return hashlib.sha256(api_key.encode()).hexdigest()
     
     def verify_api_key(self, api_key: str, hashed_key: str) -> bool:
         """Verify API key against hash"""
-        return hashlib.sha256(api_key.encode()).hexdigest() == hashed_key
+        try:
+            stored_digest = bytes.fromhex(hashed_key)
+        except ValueError:
+            return False
+        
+        # Constant-time comparison of the raw digests
+        return hmac.compare_digest(hashlib.sha256(api_key.encode()).digest(), stored_digest)
     
     def generate_api_key(self) -> str:
         """Generate a new API key"""
@@ -69,7 +169,15 @@ class SecurityManager:
     def create_jwt_token(self, payload: dict, expires_hours: int = 24) -> str:
         """Create JWT token"""
         payload['exp'] = datetime.utcnow() + timedelta(hours=expires_hours)
-        return jwt.encode(payload, self._secret_key, algorithm='HS256')
+        
+        claims = dict(payload)
+        for claim in _JWT_TIME_CLAIMS:
+            if isinstance(claims.get(claim), datetime):
+                claims[claim] = timegm(claims[claim].utctimetuple())
+        
+        signing_input = _JWT_HEADER_SEGMENT + b'.' + _b64url(json.dumps(claims, separators=(",", ":")).encode())
+        signature = self._jwt_alg.sign(signing_input, self._jwt_key)
+        return (signing_input + b'.' + _b64url(signature)).decode()
     
     def verify_jwt_token(self, token: str) -> dict:
         """Verify and decode JWT token"""
@@ -82,31 +190,16 @@ class SecurityManager:
     
     def sanitize_input(self, input_string: str) -> str:
         """Sanitize user input to prevent XSS"""
-        import bleach
+        if nh3 is not None:
+            return nh3.clean(input_string, tags=_ALLOWED_TAGS, attributes={})
         
-        allowed_tags = ['b', 'i', 'u', 'em', 'strong', 'p', 'br']
-        allowed_attributes = {}
+        import bleach
         
-        return bleach.clean(input_string, tags=allowed_tags, attributes=allowed_attributes)
+        return bleach.clean(input_string, tags=_ALLOWED_TAGS, attributes={})
     
     def validate_email_content(self, content: str) -> bool:
         """Validate email content for security"""
-        dangerous_patterns = [
-            '<script',
-            'javascript:',
-            'onload=',
-            'onerror=',
-            'onclick=',
-            'eval(',
-            'document.cookie'
-        ]
-        
-        content_lower = content.lower()
-        for pattern in dangerous_patterns:
-            if pattern in content_lower:
-                return False
-        
-        return True
+        return self._XSS_RE.search(content) is None
     
     def generate_csrf_token(self) -> str:
         """Generate CSRF token"""
@@ -128,19 +221,31 @@ class SecurityManager:
     
     def rate_limit_check(self, identifier: str, limit: int, window_minutes: int = 60) -> bool:
         """Check if rate limit is exceeded"""
-        # This would typically use Redis or another cache
-        # For now, returning True (not rate limited)
-        return True
+        # Fixed window per process; a multi-instance deployment would need Redis or similar
+        key = (identifier, window_minutes)
+        
+        with _RL_LOCK:
+            entry = _RL.get(key)
+            if entry is None:
+                _RL[key] = (time.monotonic() + window_minutes * 60, 1)
+                return True
+            
+            window_end, count = entry
+            if count >= limit:
+                return False
+            
+            _RL[key] = (window_end, count + 1)
+            return True
     
     def validate_file_upload(self, filename: str, file_content: bytes, 
                            allowed_extensions: list = None) -> bool:
         """Validate file upload for security"""
         
         if allowed_extensions is None:
-            allowed_extensions = ['pdf', 'doc', 'docx', 'txt', 'jpg', 'jpeg', 'png', 'gif']
+            allowed_extensions = _DEFAULT_ALLOWED
         
         # Check file extension
-        file_ext = filename.lower().split('.')[-1]
+        file_ext = os.path.splitext(filename)[1][1:].lower()
         if file_ext not in allowed_extensions:
             return False
         
@@ -150,17 +255,9 @@ class SecurityManager:
             return False
         
         # Check for malicious content
-        dangerous_signatures = [
-            b'<script',
-            b'javascript:',
-            b'<?php',
-            b'<%',
-            b'<iframe'
-        ]
-        
-        content_lower = file_content.lower()
-        for signature in dangerous_signatures:
-            if signature in content_lower:
-                return False
-        
-        return True
+        return self._DANGER_RE.search(file_content) is None
+
+@lru_cache(maxsize=1)
+def get_security_manager() -> SecurityManager:
+    """Get the shared SecurityManager instance"""
+    return SecurityManager()
@@ -1,207 +1,171 @@
 import streamlit as st
+import time
+from collections import deque
 from datetime import datetime
+from cachetools import TLRUCache
 
-def initialize_session_state():
-    """Initialize session state variables"""
-    
+# Minute number and its "%H:%M" label, reused for activities logged within the same minute
+_LAST_MINUTE = [0, ""]
+
+def _cache_entry_expiry(key, value, now):
+    """Expiry time for a cached (ttl_minutes, data) entry"""
+    return now + value[0] * 60
+
+# Session state defaults; mutable values are built by a lambda so sessions never share them
+_DEFAULTS = {
     # Authentication
-    if 'authenticated' not in st.session_state:
-        st.session_state.authenticated = False
-    
-    if 'user_id' not in st.session_state:
-        st.session_state.user_id = None
-    
-    if 'user_email' not in st.session_state:
-        st.session_state.user_email = None
-    
-    if 'user_name' not in st.session_state:
-        st.session_state.user_name = None
-    
-    if 'user_role' not in st.session_state:
-        st.session_state.user_role = 'user'
-    
-    if 'company' not in st.session_state:
-        st.session_state.company = None
+    'authenticated': False,
+    'user_id': None,
+    'user_email': None,
+    'user_name': None,
+    'user_role': 'user',
+    'company': None,
     
     # Navigation
-    if 'current_page' not in st.session_state:
-        st.session_state.current_page = 'Dashboard'
+    'current_page': 'Dashboard',
     
     # Campaign management
-    if 'selected_campaign' not in st.session_state:
-        st.session_state.selected_campaign = None
-    
-    if 'edit_campaign' not in st.session_state:
-        st.session_state.edit_campaign = None
-    
-    if 'campaign_analytics' not in st.session_state:
-        st.session_state.campaign_analytics = None
+    'selected_campaign': None,
+    'edit_campaign': None,
+    'campaign_analytics': None,
     
     # Template management
-    if 'selected_template' not in st.session_state:
-        st.session_state.selected_template = None
-    
-    if 'edit_template' not in st.session_state:
-        st.session_state.edit_template = None
-    
-    if 'preview_template' not in st.session_state:
-        st.session_state.preview_template = None
-    
-    if 'create_from_template' not in st.session_state:
-        st.session_state.create_from_template = None
+    'selected_template': None,
+    'edit_template': None,
+    'preview_template': None,
+    'create_from_template': None,
     
     # Contact management
-    if 'selected_contacts' not in st.session_state:
-        st.session_state.selected_contacts = []
-    
-    if 'contact_filters' not in st.session_state:
-        st.session_state.contact_filters = {}
+    'selected_contacts': lambda: [],
+    'contact_filters': lambda: {},
     
     # Quick stats for sidebar
-    if 'quick_stats' not in st.session_state:
-        st.session_state.quick_stats = {
-            'campaigns': 0,
-            'contacts': 0,
-            'templates': 0,
-            'emails_sent': 0
-        }
+    'quick_stats': lambda: {
+        'campaigns': 0,
+        'contacts': 0,
+        'templates': 0,
+        'emails_sent': 0
+    },
     
     # Recent activities
-    if 'recent_activities' not in st.session_state:
-        st.session_state.recent_activities = [
-            "Welcome to Email Sender!",
-            "Set up your first campaign",
-            "Import your contacts"
-        ]
+    'recent_activities': lambda: deque([
+        "Welcome to Email Sender!",
+        "Set up your first campaign",
+        "Import your contacts"
+    ], maxlen=10),
     
     # Form states
-    if 'form_data' not in st.session_state:
-        st.session_state.form_data = {}
+    'form_data': lambda: {},
     
     # File uploads
-    if 'uploaded_files' not in st.session_state:
-        st.session_state.uploaded_files = {}
+    'uploaded_files': lambda: {},
     
     # Notifications
-    if 'notifications' not in st.session_state:
-        st.session_state.notifications = []
+    'notifications': lambda: deque(maxlen=10),
     
     # Settings
-    if 'user_settings' not in st.session_state:
-        st.session_state.user_settings = {
-            'theme': 'light',
-            'timezone': 'UTC',
-            'email_notifications': True,
-            'default_from_name': '',
-            'default_from_email': ''
-        }
+    'user_settings': lambda: {
+        'theme': 'light',
+        'timezone': 'UTC',
+        'email_notifications': True,
+        'default_from_name': '',
+        'default_from_email': ''
+    },
     
     # Analytics filters
-    if 'analytics_filters' not in st.session_state:
-        st.session_state.analytics_filters = {
-            'date_range': '30_days',
-            'campaign_status': 'all',
-            'email_provider': 'all'
-        }
+    'analytics_filters': lambda: {
+        'date_range': '30_days',
+        'campaign_status': 'all',
+        'email_provider': 'all'
+    },
     
     # Campaign builder state
-    if 'campaign_builder' not in st.session_state:
-        st.session_state.campaign_builder = {
-            'step': 1,
-            'campaign_data': {},
-            'selected_template': None,
-            'selected_contacts': [],
-            'schedule_type': 'immediate'
-        }
+    'campaign_builder': lambda: {
+        'step': 1,
+        'campaign_data': {},
+        'selected_template': None,
+        'selected_contacts': [],
+        'schedule_type': 'immediate'
+    },
     
     # Template editor state
-    if 'template_editor' not in st.session_state:
-        st.session_state.template_editor = {
-            'template_data': {},
-            'preview_mode': False,
-            'unsaved_changes': False
-        }
+    'template_editor': lambda: {
+        'template_data': {},
+        'preview_mode': False,
+        'unsaved_changes': False
+    },
     
     # Email composer state
-    if 'email_composer' not in st.session_state:
-        st.session_state.email_composer = {
-            'subject': '',
-            'html_content': '',
-            'text_content': '',
-            'attachments': [],
-            'variables': {}
-        }
+    'email_composer': lambda: {
+        'subject': '',
+        'html_content': '',
+        'text_content': '',
+        'attachments': [],
+        'variables': {}
+    },
     
     # A/B testing state
-    if 'ab_test' not in st.session_state:
-        st.session_state.ab_test = {
-            'test_type': 'subject',
-            'variant_a': {},
-            'variant_b': {},
-            'split_percentage': 50,
-            'test_duration': 24
-        }
+    'ab_test': lambda: {
+        'test_type': 'subject',
+        'variant_a': {},
+        'variant_b': {},
+        'split_percentage': 50,
+        'test_duration': 24
+    },
     
     # Automation state
-    if 'automation' not in st.session_state:
-        st.session_state.automation = {
-            'trigger_type': 'contact_added',
-            'conditions': [],
-            'actions': [],
-            'is_active': False
-        }
+    'automation': lambda: {
+        'trigger_type': 'contact_added',
+        'conditions': [],
+        'actions': [],
+        'is_active': False
+    },
     
     # Drip campaign state
-    if 'drip_campaign' not in st.session_state:
-        st.session_state.drip_campaign = {
-            'name': '',
-            'emails': [],
-            'trigger_conditions': {},
-            'target_audience': []
-        }
+    'drip_campaign': lambda: {
+        'name': '',
+        'emails': [],
+        'trigger_conditions': {},
+        'target_audience': []
+    },
     
     # Error tracking
-    if 'errors' not in st.session_state:
-        st.session_state.errors = []
+    'errors': lambda: deque(maxlen=10),
     
     # Success messages
-    if 'success_messages' not in st.session_state:
-        st.session_state.success_messages = []
+    'success_messages': lambda: [],
     
     # Loading states
-    if 'loading_states' not in st.session_state:
-        st.session_state.loading_states = {}
+    'loading_states': lambda: {},
     
     # Modal states
-    if 'modal_open' not in st.session_state:
-        st.session_state.modal_open = False
-    
-    if 'modal_content' not in st.session_state:
-        st.session_state.modal_content = None
+    'modal_open': False,
+    'modal_content': None,
     
-    # Cache management
-    if 'cache_timestamps' not in st.session_state:
-        st.session_state.cache_timestamps = {}
-    
-    # API rate limiting
-    if 'api_calls' not in st.session_state:
-        st.session_state.api_calls = {}
+    # Cache management; entries expire after the TTL they were stored with
+    'cache': lambda: TLRUCache(maxsize=256, ttu=_cache_entry_expiry),
     
     # Feature flags
-    if 'feature_flags' not in st.session_state:
-        st.session_state.feature_flags = {
-            'ai_content_generation': True,
-            'advanced_analytics': True,
-            'automation_builder': True,
-            'ab_testing': True,
-            'drip_campaigns': True,
-            'team_collaboration': False
-        }
+    'feature_flags': lambda: {
+        'ai_content_generation': True,
+        'advanced_analytics': True,
+        'automation_builder': True,
+        'ab_testing': True,
+        'drip_campaigns': True,
+        'team_collaboration': False
+    }
+}
+
+def initialize_session_state():
+    """Initialize session state variables"""
+    for key, default in _DEFAULTS.items():
+        # Only build a default for keys that are actually missing
+        if key not in st.session_state:
+            st.session_state[key] = default() if callable(default) else default
 
 def reset_session_state():
     """Reset all session state variables"""
-    for key in list(st.session_state.keys()):
-        del st.session_state[key]
+    st.session_state.clear()
     initialize_session_state()
 
 def add_notification(message: str, type: str = 'info'):
@@ -213,17 +177,14 @@ def add_notification(message: str, type: str = 'info'):
     }
     
     if 'notifications' not in st.session_state:
-        st.session_state.notifications = []
+        st.session_state.notifications = deque(maxlen=10)
     
+    # The deque keeps only the last 10 notifications
     st.session_state.notifications.append(notification)
-    
-    # Keep only last 10 notifications
-    if len(st.session_state.notifications) > 10:
-        st.session_state.notifications = st.session_state.notifications[-10:]
 
 def clear_notifications():
     """Clear all notifications"""
-    st.session_state.notifications = []
+    st.session_state.notifications = deque(maxlen=10)
 
 def set_loading_state(key: str, loading: bool):
     """Set loading state for a specific component"""
@@ -239,14 +200,14 @@ def get_loading_state(key: str) -> bool:
 def update_user_activity(activity: str):
     """Update user activity log"""
     if 'recent_activities' not in st.session_state:
-        st.session_state.recent_activities = []
+        st.session_state.recent_activities = deque(maxlen=10)
     
-    activity_entry = f"{datetime.now().strftime('%H:%M')} - {activity}"
-    st.session_state.recent_activities.insert(0, activity_entry)
+    minute = int(time.time()) // 60
+    if minute != _LAST_MINUTE[0]:
+        _LAST_MINUTE[:] = [minute, time.strftime('%H:%M')]
     
-    # Keep only last 10 activities
-    if len(st.session_state.recent_activities) > 10:
-        st.session_state.recent_activities = st.session_state.recent_activities[:10]
+    # Newest first; the deque keeps only the last 10 activities
+    st.session_state.recent_activities.appendleft(f"{_LAST_MINUTE[1]} - {activity}")
 
 def save_form_data(form_name: str, data: dict):
     """Save form data to session state"""
@@ -266,36 +227,17 @@ def clear_form_data(form_name: str):
 
 def cache_data(key: str, data: any, ttl_minutes: int = 30):
     """Cache data with TTL"""
-    if 'cached_data' not in st.session_state:
-        st.session_state.cached_data = {}
+    if 'cache' not in st.session_state:
+        st.session_state.cache = TLRUCache(maxsize=256, ttu=_cache_entry_expiry)
     
-    if 'cache_timestamps' not in st.session_state:
-        st.session_state.cache_timestamps = {}
-    
-    st.session_state.cached_data[key] = data
-    st.session_state.cache_timestamps[key] = datetime.now()
+    st.session_state.cache[key] = (ttl_minutes, data)
 
-def get_cached_data(key: str, ttl_minutes: int = 30):
-    """Get cached data if not expired"""
-    if key not in st.session_state.get('cached_data', {}):
-        return None
-    
-    timestamp = st.session_state.get('cache_timestamps', {}).get(key)
-    if not timestamp:
-        return None
-    
-    # Check if cache is expired
-    if (datetime.now() - timestamp).total_seconds() > (ttl_minutes * 60):
-        # Remove expired cache
-        if key in st.session_state.cached_data:
-            del st.session_state.cached_data[key]
-        if key in st.session_state.cache_timestamps:
-            del st.session_state.cache_timestamps[key]
-        return None
-    
-    return st.session_state.cached_data[key]
+def get_cached_data(key: str):
+    """Get cached data if not expired; the TTL is the one given to cache_data"""
+    entry = st.session_state.get('cache', {}).get(key)
+    return entry[1] if entry else None
 
 def clear_cache():
     """Clear all cached data"""
-    st.session_state.cached_data = {}
-    st.session_state.cache_timestamps = {}
+    if 'cache' in st.session_state:
+        st.session_state.cache.clear()